@@ -0,0 +1,191 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+# -----------------------------------------------------------------------------
+# QUOTA-AWARE BATCHED WRITER
+# অনেকগুলো সেশনের সাবমিশন অল্প সময়ের জন্য বাফারে রেখে একটি মাত্র append কলে
+# শিটে পাঠানো হয়। প্রতিটি API রিকোয়েস্ট (read ও write আলাদাভাবে) প্রতি মিনিটের কোটা থেকে
+# গুনে রাখা হয় এবং 429 (rate limit) এলে jitter সহ exponential backoff দিয়ে আবার চেষ্টা করা হয়।
+# -----------------------------------------------------------------------------
+def is_rate_limited(error):
+    # gspread APIError / HTTPError / সাধারণ Exception — সব ক্ষেত্রেই 429 চেনার চেষ্টা
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None) or getattr(error, 'code', None) or getattr(error, 'status', None)
+    if status == 429:
+        return True
+    text = str(error)
+    return '429' in text or 'RESOURCE_EXHAUSTED' in text or 'Quota exceeded' in text
+
+class QuotaBudget:
+    # স্লাইডিং উইন্ডোতে (period সেকেন্ডে সর্বোচ্চ limit টি কল) কোটার হিসাব
+    def __init__(self, limit=60, period=60.0, clock=time.monotonic, sleep=time.sleep):
+        self.limit = limit
+        self.period = period
+        self.clock = clock
+        self.sleep = sleep
+        self.calls = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        while self.calls and now - self.calls[0] >= self.period:
+            self.calls.popleft()
+
+    def remaining(self):
+        with self._lock:
+            self._expire(self.clock())
+            return self.limit - len(self.calls)
+
+    def acquire(self):
+        # কোটা শেষ হলে সবচেয়ে পুরনো কলটি উইন্ডো থেকে বের হওয়া পর্যন্ত অপেক্ষা
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._expire(now)
+                if len(self.calls) < self.limit:
+                    self.calls.append(now)
+                    return
+                wait = self.period - (now - self.calls[0])
+            self.sleep(max(wait, 0.01))
+
+class MeteredWorksheet:
+    # gspread Worksheet এর র‍্যাপার: প্রতিটি API রিকোয়েস্টের আগে read বা write কোটা নেওয়া হয়,
+    # তাই একটি ফ্লাশে যতগুলো রিকোয়েস্ট যায় (হেডার পড়া, append, ...) সবই হিসাবে আসে
+    READS = ('get', 'get_all_values', 'batch_get', 'row_values', 'col_values')
+    WRITES = ('append_rows', 'delete_rows', 'batch_update', 'update')
+
+    def __init__(self, worksheet, read_budget, write_budget):
+        self.worksheet = worksheet
+        self.read_budget = read_budget
+        self.write_budget = write_budget
+
+    def __getattr__(self, name):
+        attr = getattr(self.worksheet, name)
+        budget = self.read_budget if name in self.READS else self.write_budget if name in self.WRITES else None
+        if budget is None:
+            return attr
+        def call(*args, **kwargs):
+            budget.acquire()
+            return attr(*args, **kwargs)
+        return call
+
+class BatchedSheetWriter:
+    def __init__(self, append_fn, window=2.0, max_batch=500, budget=None,
+                 max_retries=6, base_delay=1.0, max_delay=32.0, sleep=time.sleep, on_flush=None):
+        # append_fn(rows): rows (dict-এর তালিকা) একবারে শিটে যোগ করে
+        # budget: প্রতিটি চেষ্টার আগে একটি কল হিসেবে গোনা হয়; None হলে append_fn নিজেই প্রতিটি
+        # রিকোয়েস্ট গোনে (যেমন MeteredWorksheet) — তখন writer শুধু সিরিয়ালাইজ ও backoff করে
+        # on_flush(): প্রতিটি সফল ব্যাচের পর কল হয় (যেমন লোকাল স্ন্যাপশট রিফ্রেশ); পরে আরও হুক
+        # flush_hooks এ যোগ করা যায়
+        self.append_fn = append_fn
+        self.flush_hooks = [on_flush] if on_flush else []
+        self.window = window
+        self.max_batch = max_batch
+        self.budget = budget
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.stats = {'submissions': 0, 'rows': 0, 'batches': 0, 'retries': 0, 'failures': 0}
+        self._pending = []                      # [(rows, Future), ...]
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()     # একসাথে একটিই write (append/ডিলিট) চলবে
+        self._thread = None
+        self._closed = False
+
+    def submit(self, rows):
+        # রো-গুলো বাফারে রেখে Future ফেরত দেয়; ফ্লাশ সফল হলে result() == len(rows)
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("writer is closed")
+            self._pending.append((list(rows), future))
+            self.stats['submissions'] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sheet-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def withdraw(self, future):
+        # এখনো বাফারে থাকা (শিটে পাঠানো শুরু হয়নি) সাবমিশন সরিয়ে ফেলা। True হলে রো-গুলো কখনো
+        # লেখা হবে না, তাই আবার সাবমিট করা নিরাপদ; False হলে ব্যাচটি ইতিমধ্যে পাঠানো হচ্ছে/হয়ে গেছে।
+        with self._cond:
+            for i, (_, pending) in enumerate(self._pending):
+                if pending is future:
+                    del self._pending[i]
+                    future.cancel()
+                    return True
+        return False
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+            # প্রথম সাবমিশনের পর window সময় অপেক্ষা করে যত রো আসে সব একসাথে পাঠানো
+            time.sleep(self.window)
+            self.flush()
+
+    def _take_batch(self):
+        with self._cond:
+            batch, count = [], 0
+            while self._pending and (not batch or count + len(self._pending[0][0]) <= self.max_batch):
+                item = self._pending.pop(0)
+                batch.append(item)
+                count += len(item[0])
+            return batch
+
+    def flush(self):
+        # বাফারে থাকা সব রো এখনই পাঠানো (max_batch আকারের ব্যাচে)
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            rows = [row for item_rows, _ in batch for row in item_rows]
+            try:
+                self.run_exclusive(self.append_fn, rows)
+            except Exception as e:
+                self.stats['failures'] += 1
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                self.stats['batches'] += 1
+                self.stats['rows'] += len(rows)
+                for item_rows, future in batch:
+                    future.set_result(len(item_rows))
+                for hook in self.flush_hooks:
+                    hook()
+
+    def backoff(self, attempt):
+        # full jitter: 0 থেকে min(max_delay, base * 2^attempt) এর মধ্যে র‍্যান্ডম অপেক্ষা
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def run_exclusive(self, fn, *args, **kwargs):
+        # যেকোনো write কল (যেমন অ্যাডমিন ডিলিট) বা write এর মাঝখানে পড়া উচিত নয় এমন read (স্ন্যাপশট)
+        # কোটা, backoff ও ব্যাচ ফ্লাশের সাথে সিরিয়ালাইজ করে চালানো।
+        # 429 এ পুরো fn আবার চলে — তাই fn এর প্রতিটি write একটি অ্যাটমিক রিকোয়েস্ট হতে হবে
+        # (অর্ধেক প্রয়োগ হওয়া read-modify-write আবার চালানো নিরাপদ নয়)
+        with self._write_lock:
+            for attempt in range(self.max_retries + 1):
+                if self.budget is not None:
+                    self.budget.acquire()
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as e:
+                    if not is_rate_limited(e) or attempt == self.max_retries:
+                        raise
+                    self.stats['retries'] += 1
+                    self.sleep(self.backoff(attempt))
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
@@ -0,0 +1,77 @@
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from geo_index import GeoIndex
+
+# -----------------------------------------------------------------------------
+# FUZZY GEO INDEX BENCHMARK
+# আসল জিওকোডের মাপে (৮ বিভাগ / ৬৪ জেলা / ৪৯৫ উপজেলা / ৪৫৫৪ ইউনিয়ন) একটি কৃত্রিম
+# নামের তালিকা বানিয়ে একটি অক্ষর বাদ দেওয়া (টাইপো) ইউনিয়ন নাম খোঁজার ল্যাটেন্সি,
+# top-5 recall ও অ্যাডমিন প্যানেলের বাল্ক reconcile এর সময় মাপা হয়।
+# (জিওকোড সার্ভার ছাড়াও চালানো যায়, তাই নামগুলো কৃত্রিম।)
+#
+# ব্যবহার:  python benchmarks/bench_geo_index.py
+# -----------------------------------------------------------------------------
+SYLLABLES_BN = ['কা', 'লি', 'গঞ্জ', 'পুর', 'রা', 'মা', 'নি', 'শা', 'হা', 'দি', 'বা', 'চর', 'নগর', 'খা', 'লা', 'সি', 'তা', 'জা', 'রু', 'মো']
+SYLLABLES_EN = ['ka', 'li', 'ganj', 'pur', 'ra', 'ma', 'ni', 'sha', 'ha', 'di', 'ba', 'char', 'nagar', 'kha', 'la', 'si', 'ta', 'ja', 'ru', 'mo']
+
+def make_name():
+    parts = [random.randrange(len(SYLLABLES_BN)) for _ in range(random.randint(2, 4))]
+    return ''.join(SYLLABLES_BN[i] for i in parts), ''.join(SYLLABLES_EN[i] for i in parts).title()
+
+def make_records(divisions=8, districts=64, upazilas=495, unions=4554):
+    # geo_data.build_geo_aliases() এর ফরম্যাটে: [(level, path, [bn, en]), ...]
+    records, union_list = [], []
+    for d in range(divisions):
+        div = make_name()
+        records.append(('division', (div[0],), list(div)))
+        for j in range(districts // divisions):
+            dist = make_name()
+            records.append(('district', (div[0], dist[0]), list(dist)))
+            district_no = d * (districts // divisions) + j
+            for _ in range(upazilas // districts + (district_no < upazilas % districts)):
+                upz = make_name()
+                path = (div[0], dist[0], upz[0])
+                records.append(('upazila', path, list(upz)))
+                for _ in range(10 if len(union_list) < 990 else 9):
+                    uni = make_name()
+                    records.append(('union', path + (uni[0],), list(uni)))
+                    union_list.append((path, uni))
+    return records, union_list[:unions]
+
+def typo(text):
+    i = random.randrange(len(text))
+    return text[:i] + text[i + 1:]
+
+def percentile(values, p):
+    return sorted(values)[int(p * (len(values) - 1))]
+
+if __name__ == "__main__":
+    random.seed(1)
+    records, unions = make_records()
+    t = time.perf_counter()
+    index = GeoIndex(records)
+    print(f"index build: {len(index)} entries, {len(unions)} unions, {(time.perf_counter() - t) * 1000:.0f} ms")
+
+    queries = [random.choice(unions) for _ in range(2000)]
+    for label, scoped, english in [("global union, bn typo", False, False),
+                                   ("global union, en typo", False, True),
+                                   ("scoped union, bn typo", True, False)]:
+        latencies, hits = [], 0
+        for path, names in queries:
+            text = typo(names[1] if english else names[0])
+            t = time.perf_counter()
+            matches = index.suggest(text, 'union', path if scoped else ())
+            latencies.append((time.perf_counter() - t) * 1000)
+            hits += any(m.name == names[0] for m in matches)
+        print(f"{label}: p50 {statistics.median(latencies):.2f} ms, p95 {percentile(latencies, 0.95):.2f} ms, "
+              f"top-5 recall {hits / len(queries):.1%}")
+
+    keys = [path + (typo(names[0]),) for path, names in queries]
+    t = time.perf_counter()
+    index.reconcile(keys)
+    print(f"bulk reconcile {len(keys)} rows: {(time.perf_counter() - t) * 1000:.0f} ms")
@@ -0,0 +1,50 @@
+import os
+import random
+import sys
+import time
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rollups import SubmissionRollups
+
+# -----------------------------------------------------------------------------
+# ROLLUP BENCHMARK
+# ১k / ১০k / ১০০k রো-এর ইতিহাসের উপর ১০০টি নতুন রো যোগ করতে sync() কত সময় নেয় —
+# ইতিহাস যত বড়ই হোক, খরচ শুধু নতুন রো-এর সংখ্যার উপর নির্ভর করা উচিত (O(new rows))।
+# সঠিকতা (ইনক্রিমেন্টাল == পুরো রিবিল্ড, এডিটে রিবিল্ড) tests/test_rollups.py তে যাচাই হয়।
+#
+# ব্যবহার:  python benchmarks/bench_rollups.py
+# -----------------------------------------------------------------------------
+def make_rows(n, start=0):
+    rows = range(start, start + n)
+    return pd.DataFrame({
+        'Timestamp': [f"2025-01-{1 + (i // 4000) % 28:02d} {(i // 200) % 24:02d}:{i % 60:02d}:00" for i in rows],
+        'নাম': [f'officer{i // 3}' for i in rows],
+        'কর্মকর্তার যোগাযোগ নম্বর': ['01700000000'] * n,
+        'বিভাগ': [f'div{i % 8}' for i in rows],
+        'জেলা': [f'dist{i % 64}' for i in rows],
+        'উপজেলা': [f'upz{i % 495}' for i in rows],
+        'ইউনিয়ন': [f'uni{i % 4554}' for i in rows],
+        'আওতাভুক্ত গ্রাম': [random.choice([random.randint(0, 9), None, '4']) for _ in rows],
+        'ISP মোট সংখ্যা': [random.choice(['', 3, '5', None]) for _ in rows],
+    })
+
+def bench(history, new_rows=100, repeat=3):
+    base = make_rows(history)
+    df = pd.concat([base, make_rows(new_rows, history)], ignore_index=True)
+    initial, incremental = [], []
+    for _ in range(repeat):
+        rollups = SubmissionRollups()
+        t = time.perf_counter()
+        rollups.sync(base, generation=1)
+        initial.append(time.perf_counter() - t)
+        t = time.perf_counter()
+        rollups.sync(df, generation=1)
+        incremental.append(time.perf_counter() - t)
+    print(f"history {history:>7,} rows: +{new_rows} new rows {min(incremental) * 1000:6.2f} ms"
+          f"   (initial build {min(initial) * 1000:8.1f} ms)")
+
+if __name__ == "__main__":
+    random.seed(0)
+    for history in (1_000, 10_000, 100_000):
+        bench(history)
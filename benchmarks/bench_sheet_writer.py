@@ -0,0 +1,69 @@
+import os
+import random
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tests'))
+from batch_writer import BatchedSheetWriter, MeteredWorksheet, QuotaBudget
+from fake_sheets import FakeSheetsServer
+from sheet_store import SHEET_COLUMNS, gsheets_appender
+
+# -----------------------------------------------------------------------------
+# SHEET WRITER BENCHMARK
+# ৪০টি সেশন একসাথে ১-৩ রো-এর সাবমিশন পাঠায় একটি লোকাল ফেক শিট সার্ভারে, যা প্রতি
+# মিনিটে ৬০টির বেশি read বা write এ 429 দেয়। দুই মোডেই অ্যাপের আসল gsheets_appender চলে
+# (হেডার read + append_rows): সরাসরি প্রতি সাবমিশনে একবার বনাম BatchedSheetWriter (প্রতিটি
+# রিকোয়েস্ট MeteredWorksheet দিয়ে গোনা) — প্রতি মিনিটে কতগুলো সাবমিশন সফল/ব্যর্থ হয় তা মাপা হয়।
+# সময় SCALE গুণ দ্রুত চালানো হয় (১ মিনিট = ৬ সেকেন্ড)।
+#
+# ব্যবহার:  python benchmarks/bench_sheet_writer.py [সেকেন্ড]
+# -----------------------------------------------------------------------------
+SCALE = 10.0
+PERIOD = 60.0 / SCALE
+LIMIT = 60          # গুগল শিটের ডিফল্ট read ও write কোটা (প্রতি মিনিটে)
+
+def run(mode, sessions=40, duration=30.0):
+    server = FakeSheetsServer(limit=LIMIT, period=PERIOD, latency=0.03).start()
+    sheet = server.worksheet()
+    direct = gsheets_appender(sheet)
+    metered = MeteredWorksheet(sheet, QuotaBudget(LIMIT, PERIOD), QuotaBudget(LIMIT, PERIOD))
+    writer = BatchedSheetWriter(gsheets_appender(metered), window=2.0 / SCALE,
+                                base_delay=1.0 / SCALE, max_delay=32.0 / SCALE)
+    ok, failed = [0], [0]
+    lock = threading.Lock()
+    stop = time.monotonic() + duration
+
+    def session():
+        while time.monotonic() < stop:
+            rows = [dict.fromkeys(SHEET_COLUMNS, 'x') for _ in range(random.randint(1, 3))]
+            try:
+                if mode == 'direct':
+                    direct(rows)
+                else:
+                    writer.submit(rows).result(timeout=60)
+                result = ok
+            except Exception:
+                result = failed
+            with lock:
+                result[0] += 1
+            time.sleep(random.uniform(0.05, 0.15))
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+    writer.close()
+    server.stop()
+    minutes = duration / PERIOD
+    print(f"{mode:8s}: {ok[0] / minutes:6.0f} ok submissions/min, {failed[0] / minutes:6.0f} failed/min, "
+          f"{server.requests['row_values'] / minutes:4.0f} reads/min, {server.requests['append_rows'] / minutes:4.0f} appends/min, "
+          f"{server.rejected} rejected by server, rows stored {len(server.rows())}"
+          + (f", retries {writer.stats['retries']}" if mode == 'batched' else ""))
+
+if __name__ == "__main__":
+    random.seed(0)
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 30.0
+    run('direct', duration=duration)
+    run('batched', duration=duration)
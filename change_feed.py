@@ -0,0 +1,245 @@
+import json
+import math
+import os
+import threading
+import uuid
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:     # Windows — একই প্রসেসের থ্রেড লকই যথেষ্ট
+    fcntl = None
+
+# -----------------------------------------------------------------------------
+# CHANGE-DATA-CAPTURE FEED
+# শিটে প্রতিটি সফল write (সাবমিশন, ডিলিট, রিকনসিলিয়েশন) একটি append-only
+# JSON-lines ফাইলে ক্রমিক seq নম্বরসহ লেখা হয়। অন্য টিমগুলো পুরো শিট বারবার
+# পড়ার বদলে একটি cursor থেকে এই ফাইল tail করে শুধু নতুন পরিবর্তনগুলো নিতে পারে।
+#
+# ইভেন্টের ফরম্যাট (প্রতি লাইনে একটি):
+#   {"epoch": "e3f9c...", "seq": 42, "ts": "2025-01-01 10:00:00", "op": "insert" | "delete" | "update",
+#    "row_index": 17, "row": {...}, "before": {...}  # শুধু update এ}
+#
+# epoch: ফিড প্রথমবার তৈরি হওয়ার সময় বানানো আইডি। ফিড মুছে নতুন করে তৈরি হলে seq আবার
+# ১ থেকে শুরু হয় কিন্তু epoch বদলে যায় — তাই পুরনো cursor দিয়ে পড়লেও নতুন ইভেন্ট বাদ পড়ে না।
+#
+# দুটি স্টোরেজ: ChangeFeed (লোকাল JSON-lines ফাইল) ও SheetChangeFeed (একই স্প্রেডশিটের আলাদা
+# ট্যাব)। Streamlit Cloud এ লোকাল ডিস্ক প্রতি রিবুট/রিডিপ্লয়ে মুছে যায়, তাই অ্যাপ শিট ট্যাব ব্যবহার করে।
+# -----------------------------------------------------------------------------
+def _jsonable(value):
+    if hasattr(value, 'item'):          # numpy/pandas স্কেলার
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+def _clean_row(row):
+    return {str(k): _jsonable(v) for k, v in row.items()}
+
+def new_epoch():
+    # 'e' দিয়ে শুরু, যাতে শিট থেকে পড়ার সময় সংখ্যা হিসেবে পার্স না হয়
+    return "e" + uuid.uuid4().hex[:12]
+
+def _build_events(op, rows, row_indexes, before, epoch, last_seq):
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    events = []
+    for i, row in enumerate(rows):
+        event = {"epoch": epoch, "seq": last_seq + i + 1, "ts": ts, "op": op, "row_index": None, "row": _clean_row(row)}
+        if row_indexes is not None:
+            event["row_index"] = int(row_indexes[i])
+        if before is not None:
+            event["before"] = _clean_row(before[i])
+        events.append(event)
+    return events
+
+def _resume(cursor, epoch):
+    # cursor: {"epoch", "seq", "offset"}। cursor অন্য epoch এর হলে ফিডটি নতুন করে তৈরি হয়েছে —
+    # তখন নতুন ফিডের শুরু থেকে পড়া হয় (কনজিউমার epoch বদল দেখে সতর্ক করতে পারে)
+    cursor = {"epoch": None, "seq": 0, "offset": 0, **(cursor or {})}
+    if cursor["epoch"] is not None and cursor["epoch"] != epoch:
+        cursor.update(seq=0, offset=0)
+    cursor["epoch"] = epoch
+    return cursor
+
+class ChangeFeed:
+    def __init__(self, path=".changefeed/changes.jsonl"):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _epoch(f):
+        # ফাইলের প্রথম সম্পূর্ণ লাইনের epoch
+        f.seek(0)
+        first = f.readline()
+        return json.loads(first).get("epoch") if first.endswith(b"\n") else None
+
+    def _last_seq(self, f):
+        # ফাইলের শেষ সম্পূর্ণ লাইন থেকে সর্বশেষ seq পড়া; অসম্পূর্ণ (crash-এ ভাঙা) লাইন কেটে ফেলা
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return 0
+        block = min(size, 64 * 1024)
+        f.seek(size - block)
+        tail = f.read(block)
+        if not tail.endswith(b"\n"):
+            cut = tail.rfind(b"\n") + 1
+            f.truncate(size - block + cut)
+            tail = tail[:cut]
+        lines = tail.splitlines()
+        return json.loads(lines[-1])["seq"] if lines else 0
+
+    def append(self, op, rows, row_indexes=None, before=None):
+        # rows: dict-এর তালিকা; row_indexes/before: প্রতিটি রো-এর শিট ইনডেক্স ও আগের মান
+        rows = list(rows)
+        if not rows:
+            return []
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock, open(self.path, "a+b") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)   # একাধিক প্রসেস (রেপ্লিকা) থেকে লিখলেও seq ক্রম ঠিক থাকে
+            seq = self._last_seq(f)
+            epoch = (self._epoch(f) if seq else None) or new_epoch()
+            events = _build_events(op, rows, row_indexes, before, epoch, seq)
+            f.seek(0, os.SEEK_END)
+            f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        return [e["seq"] for e in events]
+
+    def read(self, cursor=None, limit=None):
+        # cursor: {"epoch": ফিডের epoch, "seq": শেষ প্রসেস করা seq, "offset": ফাইলের বাইট অফসেট}
+        # রিটার্ন: (ইভেন্টের তালিকা, নতুন cursor)। seq দিয়েই ডুপ্লিকেট বাদ দেওয়া হয়,
+        # তাই অফসেট ভুল/পুরনো হলেও কোনো ইভেন্ট দুবার আসে না।
+        events = []
+        if not os.path.exists(self.path):
+            return events, dict(cursor or {"epoch": None, "seq": 0, "offset": 0})
+        with open(self.path, "rb") as f:
+            cursor = _resume(cursor, self._epoch(f))
+            size = f.seek(0, os.SEEK_END)
+            offset = cursor["offset"]
+            f.seek(offset if offset <= size else 0)
+            while limit is None or len(events) < limit:
+                line = f.readline()
+                if not line.endswith(b"\n"):    # এখনো লেখা শেষ হয়নি এমন লাইন
+                    break
+                cursor["offset"] = f.tell()
+                event = json.loads(line)
+                if event["seq"] <= cursor["seq"]:
+                    continue
+                events.append(event)
+                cursor["seq"] = event["seq"]
+        return events, cursor
+
+class SheetChangeFeed:
+    # একই ফরম্যাটের ইভেন্ট, কিন্তু গুগল শিটের একটি ট্যাবে (প্রতি ইভেন্টে একটি রো) — অ্যাপ রিবুট হলেও থাকে
+    # এবং অন্য মেশিনের টিমগুলোও শিট API দিয়ে পড়তে পারে। রো ১ হেডার, seq n এর ইভেন্ট রো n + 1 এ, তাই
+    # কনজিউমার cursor এর পরের রেঞ্জটুকুই পড়ে। লেখা হয় শুধু append_rows দিয়ে (একটি অ্যাটমিক রিকোয়েস্ট)।
+    #
+    # enqueue() ইভেন্ট মেমোরির outbox এ রাখে, deliver() সেগুলো ট্যাবে পাঠায়। পাঠানো ব্যর্থ হলে ইভেন্ট
+    # outbox এই থাকে; রিকোয়েস্ট আসলে পৌঁছে গিয়ে শুধু রেসপন্স হারালে পরের চেষ্টায় ট্যাবের শেষ seq দেখে
+    # সেগুলো বাদ দেওয়া হয় — তাই কোনো ইভেন্ট হারায় না বা দুবার লেখা হয় না।
+    COLUMNS = ["epoch", "seq", "ts", "op", "row_index", "row", "before"]
+
+    def __init__(self, worksheet):
+        # worksheet: gspread Worksheet (বা একই মেথডের MeteredWorksheet)
+        self.worksheet = worksheet
+        self._lock = threading.Lock()
+        self._outbox = []       # এখনো ট্যাবে না পৌঁছানো ইভেন্ট
+        self._tail = None       # (হেডার আছে কিনা, epoch, শেষ seq) — ট্যাব থেকে একবার পড়ে মনে রাখা
+
+    def pending(self):
+        return len(self._outbox)
+
+    def enqueue(self, op, rows, row_indexes=None, before=None):
+        # শিটে write সফল হওয়ার পরে কল করতে হয়; seq/epoch ট্যাবে পাঠানোর সময় বসে
+        events = _build_events(op, list(rows), row_indexes, before, None, 0)
+        with self._lock:
+            for event in events:
+                event["seq"] = None
+                self._outbox.append(event)
+        return len(events)
+
+    def _load_tail(self):
+        # হেডার, প্রথম ইভেন্টের epoch ও seq কলাম একটি batch_get রিকোয়েস্টে
+        header, first, seqs = self.worksheet.batch_get(["A1", "A2", "B2:B"])
+        epoch = first[0][0] if first and first[0] else None
+        return bool(header), epoch, max((int(r[0]) for r in seqs if r and r[0]), default=0)
+
+    @classmethod
+    def _cells(cls, event):
+        return [event["epoch"], event["seq"], event["ts"], event["op"],
+                "" if event["row_index"] is None else event["row_index"],
+                json.dumps(event["row"], ensure_ascii=False),
+                json.dumps(event["before"], ensure_ascii=False) if "before" in event else ""]
+
+    def deliver(self):
+        # outbox এর সব ইভেন্ট একটি append_rows রিকোয়েস্টে পাঠানো; রিটার্ন: লেখা হওয়া seq গুলো
+        with self._lock:
+            if not self._outbox:
+                return []
+            if self._tail is None:
+                has_header, epoch, last_seq = self._load_tail()
+                # আগের ব্যর্থ চেষ্টার ইভেন্ট ট্যাবে থাকলে (রেসপন্স হারিয়েছিল) বাদ; বাকিগুলো নতুন করে seq পায়
+                self._outbox = [e for e in self._outbox if e["seq"] is None or e["epoch"] != epoch or e["seq"] > last_seq]
+                for event in self._outbox:
+                    event["seq"] = None
+                self._tail = (has_header, epoch or new_epoch(), last_seq)
+            has_header, epoch, last_seq = self._tail
+            for event in self._outbox:
+                if event["seq"] is None:
+                    last_seq += 1
+                    event.update(epoch=epoch, seq=last_seq)
+            values = [self._cells(e) for e in self._outbox]
+            if not has_header:
+                values.insert(0, self.COLUMNS)
+            try:
+                self.worksheet.append_rows(values, value_input_option="RAW", table_range="A1")
+            except Exception:
+                self._tail = None   # লেখা হয়েছে কিনা জানা নেই — পরের চেষ্টায় ট্যাব থেকে যাচাই
+                raise
+            delivered, self._outbox = self._outbox, []
+            self._tail = (True, epoch, last_seq)
+        return [e["seq"] for e in delivered]
+
+    def append(self, op, rows, row_indexes=None, before=None):
+        self.enqueue(op, rows, row_indexes, before)
+        return self.deliver()
+
+    @staticmethod
+    def _event(record):
+        record = dict(zip(SheetChangeFeed.COLUMNS, list(record) + [""] * len(SheetChangeFeed.COLUMNS)))
+        event = {"epoch": record["epoch"], "seq": int(record["seq"]), "ts": record["ts"], "op": record["op"],
+                 "row_index": int(record["row_index"]) if record["row_index"] != "" else None,
+                 "row": json.loads(record["row"])}
+        if record["before"]:
+            event["before"] = json.loads(record["before"])
+        return event
+
+    @staticmethod
+    def _range(seq, limit):
+        # seq এর পরের ইভেন্টগুলোর রেঞ্জ (limit টি রো বা ট্যাবের শেষ পর্যন্ত)
+        start = seq + 2
+        return f"A{start}:G" + ("" if limit is None else str(start + limit - 1))
+
+    def read(self, cursor=None, limit=None):
+        # লোকাল ফিডের মতোই cursor; এখানে offset ব্যবহার হয় না। epoch যাচাইয়ের জন্য A2 ও cursor এর পরের
+        # রেঞ্জ একটি batch_get এ পড়া হয় — পুরো ট্যাব কখনো পড়া হয় না
+        cursor = {"epoch": None, "seq": 0, "offset": 0, **(cursor or {})}
+        first, rows = self.worksheet.batch_get(["A2", self._range(cursor["seq"], limit)])
+        if not first or not first[0]:
+            return [], cursor
+        resumed = _resume(cursor, first[0][0])
+        if resumed["seq"] != cursor["seq"]:
+            rows = self.worksheet.get(self._range(0, limit))
+        events = []
+        for record in rows:
+            if len(record) < 2 or not record[1]:
+                continue
+            event = self._event(record)
+            if event["seq"] <= resumed["seq"]:
+                continue
+            events.append(event)
+            resumed["seq"] = event["seq"]
+        return events, resumed
@@ -0,0 +1,89 @@
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from change_feed import ChangeFeed, SheetChangeFeed
+
+# -----------------------------------------------------------------------------
+# CHANGE FEED CONSUMER (উদাহরণ)
+# চেঞ্জ ফিড tail করে একটি লোকাল SQLite ডাটাবেজে জেলা ভিত্তিক রো সংখ্যা রাখে।
+# ইভেন্ট প্রয়োগ ও cursor আপডেট একই ট্রানজ্যাকশনে হয়, তাই মাঝপথে বন্ধ হয়ে
+# আবার চালু হলেও প্রতিটি ইভেন্ট ঠিক একবারই প্রয়োগ হয় (exactly-once)।
+# ফিডের epoch বদলালে (ফিড নতুন করে তৈরি হয়েছে) সতর্ক করে নতুন ফিডের শুরু থেকে পড়া হয়।
+#
+# ব্যবহার:  python change_feed_consumer.py --sheet <স্প্রেডশিট URL> --credentials service_account.json --follow
+#           python change_feed_consumer.py --feed .changefeed/changes.jsonl   (লোকাল ফাইল ফিড)
+# -----------------------------------------------------------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feed_cursor (id INTEGER PRIMARY KEY CHECK (id = 1), epoch TEXT, seq INTEGER, byte_offset INTEGER);
+CREATE TABLE IF NOT EXISTS changes (epoch TEXT, seq INTEGER, ts TEXT, op TEXT, row_index INTEGER, payload TEXT, PRIMARY KEY (epoch, seq));
+CREATE TABLE IF NOT EXISTS district_rows (division TEXT, district TEXT, rows INTEGER, PRIMARY KEY (division, district));
+INSERT OR IGNORE INTO feed_cursor VALUES (1, NULL, 0, 0);
+"""
+
+def load_cursor(db):
+    epoch, seq, offset = db.execute("SELECT epoch, seq, byte_offset FROM feed_cursor WHERE id = 1").fetchone()
+    return {"epoch": epoch, "seq": seq, "offset": offset}
+
+def bump(db, row, delta):
+    key = (row.get("বিভাগ") or "", row.get("জেলা") or "")
+    db.execute("INSERT OR IGNORE INTO district_rows VALUES (?, ?, 0)", key)
+    db.execute("UPDATE district_rows SET rows = rows + ? WHERE division = ? AND district = ?", (delta, *key))
+
+def apply_event(db, event):
+    db.execute("INSERT INTO changes VALUES (?, ?, ?, ?, ?, ?)",
+               (event["epoch"], event["seq"], event["ts"], event["op"], event["row_index"], json.dumps(event, ensure_ascii=False)))
+    if event["op"] == "insert":
+        bump(db, event["row"], 1)
+    elif event["op"] == "delete":
+        bump(db, event["row"], -1)
+    elif event["op"] == "update":
+        bump(db, event["before"], -1)
+        bump(db, event["row"], 1)
+
+def consume(feed, db, batch_size=500):
+    # একটি ব্যাচ পড়ে প্রয়োগ করা; প্রয়োগ হওয়া ইভেন্টের সংখ্যা ফেরত দেয়
+    previous = load_cursor(db)
+    events, cursor = feed.read(previous, limit=batch_size)
+    if previous["epoch"] is not None and cursor["epoch"] != previous["epoch"]:
+        # ফিড মুছে নতুন করে তৈরি হয়েছে — পুরনো ফিডের শেষ দিকের ইভেন্ট হারিয়ে থাকতে পারে
+        print(f"warning: change feed epoch changed ({previous['epoch']} -> {cursor['epoch']}); "
+              f"events after seq {previous['seq']} of the old feed may be missing, resync from the sheet if needed",
+              file=sys.stderr)
+    with db:    # একটি ট্রানজ্যাকশন: ইভেন্ট + cursor একসাথে কমিট বা রোলব্যাক
+        for event in events:
+            apply_event(db, event)
+        db.execute("UPDATE feed_cursor SET epoch = ?, seq = ?, byte_offset = ? WHERE id = 1",
+                   (cursor["epoch"], cursor["seq"], cursor["offset"]))
+    return len(events)
+
+def open_sheet_feed(url, worksheet, credentials):
+    # অ্যাপের সার্ভিস অ্যাকাউন্ট (বা শিটটি শেয়ার করা অন্য কোনো অ্যাকাউন্ট) দিয়ে ফিড ট্যাব পড়া
+    import gspread
+    return SheetChangeFeed(gspread.service_account(filename=credentials).open_by_url(url).worksheet(worksheet))
+
+def main():
+    parser = argparse.ArgumentParser(description="Tail the survey change feed into a local SQLite mirror.")
+    parser.add_argument("--sheet", help="spreadsheet URL whose change-feed tab to read")
+    parser.add_argument("--worksheet", default="changes")
+    parser.add_argument("--credentials", default="service_account.json", help="Google service account key file")
+    parser.add_argument("--feed", default=".changefeed/changes.jsonl", help="local JSON-lines feed (when --sheet is not given)")
+    parser.add_argument("--db", default="change_feed_mirror.sqlite")
+    parser.add_argument("--follow", action="store_true", help="keep polling for new changes")
+    parser.add_argument("--interval", type=float, default=5.0)
+    args = parser.parse_args()
+
+    feed = open_sheet_feed(args.sheet, args.worksheet, args.credentials) if args.sheet else ChangeFeed(args.feed)
+    db = sqlite3.connect(args.db)
+    db.executescript(SCHEMA)
+    while True:
+        while consume(feed, db):
+            pass
+        print(f"caught up at seq {load_cursor(db)['seq']}")
+        if not args.follow:
+            break
+        time.sleep(args.interval)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import threading
+
+# -----------------------------------------------------------------------------
+# COVERAGE GAP INDEX
+# জিওকোড ট্রি (build_bd_data) থেকে প্রত্যাশিত উপজেলা/ইউনিয়নের সেট এবং জমা পড়া
+# (বিভাগ, জেলা, উপজেলা, ইউনিয়ন) কী-এর সেট রেখে কোনগুলো বাকি আছে তা বের করা।
+# নতুন রো append হলে শুধু সেগুলোই ইনডেক্সে যোগ হয়, পুরো শিট আবার স্ক্যান করা হয় না।
+# -----------------------------------------------------------------------------
+class CoverageIndex:
+    def __init__(self, tree):
+        self.expected_upz = {}   # (বিভাগ, জেলা) -> {উপজেলা}
+        self.expected_uni = {}   # (বিভাগ, জেলা, উপজেলা) -> {ইউনিয়ন}
+        for div, dists in tree.items():
+            for dist, upzs in dists.items():
+                self.expected_upz[(div, dist)] = set(upzs)
+                for upz, unis in upzs.items():
+                    self.expected_uni[(div, dist, upz)] = set(unis)
+        self.total_upazilas = sum(len(v) for v in self.expected_upz.values())
+        self.total_unions = sum(len(v) for v in self.expected_uni.values())
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.covered_upz = set()
+            self.covered_uni = set()
+            self.unknown = set()      # জিওকোড তালিকায় নেই এমন (হাতে লেখা) কী
+            self.district_counts = {} # (বিভাগ, জেলা) -> [কভার্ড উপজেলা, কভার্ড ইউনিয়ন]
+            self.rows = 0
+            self.generation = None
+
+    def add(self, div, dist, upz, uni):
+        upz_key = (div, dist, upz)
+        if upz_key not in self.expected_uni:
+            self.unknown.add(upz_key + (uni,))
+            return
+        counts = self.district_counts.setdefault((div, dist), [0, 0])
+        if upz_key not in self.covered_upz:
+            self.covered_upz.add(upz_key)
+            counts[0] += 1
+        uni_key = upz_key + (uni,)
+        if uni in self.expected_uni[upz_key]:
+            if uni_key not in self.covered_uni:
+                self.covered_uni.add(uni_key)
+                counts[1] += 1
+        elif uni:
+            self.unknown.add(uni_key)
+
+    def sync(self, keys, generation):
+        # keys: শিটের সব রো-এর (বিভাগ, জেলা, উপজেলা, ইউনিয়ন) টাপল, শিটের ক্রমে।
+        # generation: স্ন্যাপশটের edit generation (df.attrs["generation"]) — একই থাকলে শিট শুধু
+        # append হয়েছে, তাই নতুন রোগুলোই যোগ হয়; বদলালে (মাঝের কোনো রো এডিট/ডিলিট) নতুন করে বানানো হয়।
+        with self._lock:
+            if generation is None or generation != self.generation or len(keys) < self.rows:
+                self.reset()
+                self.generation = generation
+            for key in keys[self.rows:]:
+                self.add(*key)
+            self.rows = len(keys)
+
+    @property
+    def submitted_upazilas(self):
+        return len(self.covered_upz)
+
+    @property
+    def submitted_unions(self):
+        return len(self.covered_uni)
+
+    def district_summary(self, division=None):
+        rows = []
+        for (div, dist), upzs in self.expected_upz.items():
+            if division and div != division: continue
+            covered_upz, covered_uni = self.district_counts.get((div, dist), (0, 0))
+            total_uni = sum(len(self.expected_uni[(div, dist, u)]) for u in upzs)
+            rows.append({
+                'বিভাগ': div, 'জেলা': dist,
+                'মোট উপজেলা': len(upzs), 'বাকি উপজেলা': len(upzs) - covered_upz,
+                'মোট ইউনিয়ন': total_uni, 'বাকি ইউনিয়ন': total_uni - covered_uni,
+            })
+        return rows
+
+    def missing_upazilas(self, division=None, district=None):
+        return [(div, dist, upz)
+                for (div, dist), upzs in self.expected_upz.items()
+                if (not division or div == division) and (not district or dist == district)
+                for upz in sorted(upzs) if (div, dist, upz) not in self.covered_upz]
+
+    def missing_unions(self, division=None, district=None, upazila=None):
+        return [key + (uni,)
+                for key, unis in self.expected_uni.items()
+                if (not division or key[0] == division) and (not district or key[1] == district)
+                and (not upazila or key[2] == upazila)
+                for uni in sorted(unis) if key + (uni,) not in self.covered_uni]
@@ -0,0 +1,100 @@
+import streamlit as st
+import json
+import urllib.request
+from geo_index import GeoIndex
+from coverage_gaps import CoverageIndex
+
+# -----------------------------------------------------------------------------
+# GEOGRAPHICAL DATA LOADER (সার্ভে ফর্ম ও অ্যাডমিন প্যানেল দুই জায়গাতেই ব্যবহৃত)
+# -----------------------------------------------------------------------------
+NUHIL_RAW = {
+    "divisions": "https://raw.githubusercontent.com/nuhil/bangladesh-geocode/master/divisions/divisions.json",
+    "districts": "https://raw.githubusercontent.com/nuhil/bangladesh-geocode/master/districts/districts.json",
+    "upazilas": "https://raw.githubusercontent.com/nuhil/bangladesh-geocode/master/upazilas/upazilas.json",
+    "unions": "https://raw.githubusercontent.com/nuhil/bangladesh-geocode/master/unions/unions.json",
+}
+
+def fetch_json(url):
+    with urllib.request.urlopen(url, timeout=30) as r:
+        return json.loads(r.read().decode('utf-8'))
+
+def extract_data(raw):
+    if isinstance(raw, list):
+        for item in raw:
+            if isinstance(item, dict) and 'data' in item: return item['data']
+    if isinstance(raw, dict) and 'data' in raw: return raw['data']
+    return []
+
+@st.cache_data
+def load_geocode():
+    # চারটি লেভেলের কাঁচা (raw) ডাটা একবারই ডাউনলোড করা হয়
+    try:
+        return {level: extract_data(fetch_json(url)) for level, url in NUHIL_RAW.items()}
+    except:
+        return {level: [] for level in NUHIL_RAW}
+
+def _walk_geocode(raw):
+    # প্রতিটি ইউনিয়ন/উপজেলার জন্য (বিভাগ, জেলা, উপজেলা) পাথ ও ইংরেজি নাম বের করা
+    div_map = {str(d['id']): (d.get('bn_name') or d.get('name'), d.get('name')) for d in raw['divisions']}
+    dist_map = {str(d['id']): {'bn_name': d.get('bn_name') or d.get('name'), 'name': d.get('name'), 'division_id': str(d.get('division_id'))} for d in raw['districts']}
+    upz_map = {str(u['id']): {'bn_name': u.get('bn_name') or u.get('name'), 'name': u.get('name'), 'district_id': str(u.get('district_id'))} for u in raw['upazilas']}
+
+    uni_map = {}
+    for u in raw['unions']:
+        upid = str(u.get('upazilla_id') or u.get('upazila_id') or '')
+        uni_map.setdefault(upid, []).append((u.get('bn_name') or u.get('name'), u.get('name')))
+
+    for upz_id, upz in upz_map.items():
+        dist_entry = dist_map.get(upz.get('district_id'))
+        if not dist_entry: continue
+        div_name, div_en = div_map.get(dist_entry.get('division_id'), ('অন্যান্য', None))
+        yield {
+            'division': (div_name, div_en),
+            'district': (dist_entry.get('bn_name'), dist_entry.get('name')),
+            'upazila': (upz.get('bn_name'), upz.get('name')),
+            'unions': uni_map.get(upz_id, []),
+        }
+
+@st.cache_data
+def build_bd_data():
+    try:
+        data_tree = {}
+        for node in _walk_geocode(load_geocode()):
+            div_name, dist_name, upz_name = node['division'][0], node['district'][0], node['upazila'][0]
+            data_tree.setdefault(div_name, {}).setdefault(dist_name, {})[upz_name] = [bn for bn, _ in node['unions']]
+        return data_tree
+    except:
+        return {}
+
+@st.cache_data
+def build_geo_aliases():
+    # ফাজি ইনডেক্সের জন্য প্রতিটি ক্যানোনিকাল নামের পাথ ও বাংলা/ইংরেজি বানান
+    # ফরম্যাট: [(level, path, [bn_name, en_name]), ...]
+    try:
+        seen = set()
+        records = []
+        def add(level, path, names):
+            if path in seen: return
+            seen.add(path)
+            records.append((level, path, [n for n in names if n]))
+
+        for node in _walk_geocode(load_geocode()):
+            div, dist, upz = node['division'], node['district'], node['upazila']
+            add('division', (div[0],), div)
+            add('district', (div[0], dist[0]), dist)
+            add('upazila', (div[0], dist[0], upz[0]), upz)
+            for uni in node['unions']:
+                add('union', (div[0], dist[0], upz[0], uni[0]), uni)
+        return records
+    except:
+        return []
+
+@st.cache_resource
+def get_geo_index():
+    # সব সেশনের জন্য একটিই প্রি-কম্পিউটেড ইনডেক্স
+    return GeoIndex(build_geo_aliases())
+
+@st.cache_resource
+def get_coverage_index():
+    # জমা পড়া রো-গুলো এই ইনডেক্সে ধাপে ধাপে (incrementally) যোগ হয়
+    return CoverageIndex(build_bd_data())
@@ -0,0 +1,128 @@
+import unicodedata
+from collections import namedtuple
+from difflib import SequenceMatcher
+
+# -----------------------------------------------------------------------------
+# FUZZY GEO INDEX
+# "অন্যান্য" অপশনে হাতে লেখা বিভাগ/জেলা/উপজেলা/ইউনিয়নের নামকে ক্যানোনিকাল
+# জিওকোড নামের সাথে মেলানোর জন্য ক্যারেক্টার ট্রাইগ্রাম (n-gram) ইনডেক্স।
+# -----------------------------------------------------------------------------
+LEVELS = ('division', 'district', 'upazila', 'union')
+
+# নামের সাথে লেখা প্রশাসনিক শব্দগুলো মেলানোর আগে বাদ দেওয়া হয়
+NOISE_WORDS = {
+    'বিভাগ', 'জেলা', 'উপজেলা', 'ইউনিয়ন', 'পরিষদ', 'ইউপি',
+    'division', 'district', 'zila', 'zilla', 'upazila', 'upazilla', 'thana', 'union', 'parishad', 'up',
+}
+
+GeoMatch = namedtuple('GeoMatch', ['name', 'path', 'score'])
+
+def normalize_name(text):
+    text = unicodedata.normalize('NFC', str(text or '')).lower()
+    # বাংলা কার/ফলা (combining mark) রেখে শুধু যতিচিহ্ন বাদ দেওয়া; ZWJ/ZWNJ (Cf) শব্দের অংশ
+    # (যেমন "র‍্যাব"), তাই ফাঁকা না বানিয়ে পুরোপুরি মুছে ফেলা হয়
+    text = ''.join('' if unicodedata.category(c) == 'Cf' else c if unicodedata.category(c)[0] in 'LMN' else ' '
+                   for c in text)
+    words = [w for w in text.split() if w not in NOISE_WORDS]
+    return ' '.join(words)
+
+def ngrams(text, n=3):
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+class GeoIndex:
+    def __init__(self, records, n=3):
+        # records: [(level, path, [alias, ...]), ...] — geo_data.build_geo_aliases() থেকে
+        self.n = n
+        self.entries = []                                   # entry_id -> (level, path)
+        self.aliases = []                                   # alias_id -> (entry_id, normalized, gram_count)
+        self.exact = {level: {} for level in LEVELS}        # normalized -> [entry_id, ...]
+        self.postings = {level: {} for level in LEVELS}     # gram -> [alias_id, ...]
+        self.paths = set()                                  # স্কোপ যাচাইয়ের জন্য সব ক্যানোনিকাল পাথ
+
+        for level, path, names in records:
+            if level not in self.exact: continue
+            entry_id = len(self.entries)
+            self.entries.append((level, tuple(path)))
+            self.paths.add(tuple(path))
+            for norm in {normalize_name(n) for n in names}:
+                if not norm: continue
+                grams = ngrams(norm, self.n)
+                alias_id = len(self.aliases)
+                self.aliases.append((entry_id, norm, len(grams)))
+                self.exact[level].setdefault(norm, []).append(entry_id)
+                for g in grams:
+                    self.postings[level].setdefault(g, []).append(alias_id)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _match(self, entry_id, score):
+        _, path = self.entries[entry_id]
+        return GeoMatch(path[-1], path, round(score, 3))
+
+    def suggest(self, text, level, scope=(), limit=5, min_score=0.35):
+        # scope: প্যারেন্ট পাথ (যেমন (বিভাগ, জেলা)) — দিলে শুধু সেই এলাকার নাম খোঁজা হয়
+        norm = normalize_name(text)
+        if not norm or level not in self.exact:
+            return []
+        scope = tuple(s for s in scope if s)
+        # প্যারেন্ট নিজেই হাতে লেখা (অচেনা) হলে যতটুকু চেনা যায় ততটুকু স্কোপ রাখা
+        while scope and scope not in self.paths:
+            scope = scope[:-1]
+        in_scope = lambda eid: self.entries[eid][1][:len(scope)] == scope
+
+        exact = [eid for eid in self.exact[level].get(norm, []) if in_scope(eid)]
+        if exact:
+            return [self._match(eid, 1.0) for eid in exact[:limit]]
+
+        # ট্রাইগ্রাম ওভারল্যাপ গুনে Dice স্কোর দিয়ে প্রার্থী বাছাই
+        grams = ngrams(norm, self.n)
+        hits = {}
+        postings = self.postings[level]
+        for g in grams:
+            for alias_id in postings.get(g, ()):
+                hits[alias_id] = hits.get(alias_id, 0) + 1
+
+        best = {}
+        for alias_id, common in hits.items():
+            entry_id, _, gram_count = self.aliases[alias_id]
+            if not in_scope(entry_id): continue
+            dice = 2.0 * common / (len(grams) + gram_count)
+            if dice > best.get(entry_id, (0, None))[0]:
+                best[entry_id] = (dice, alias_id)
+
+        # সেরা প্রার্থীদের এডিট-ডিসট্যান্স রেশিও দিয়ে পুনরায় সাজানো
+        shortlist = sorted(best.items(), key=lambda kv: kv[1][0], reverse=True)[:limit * 4]
+        ranked = []
+        for entry_id, (dice, alias_id) in shortlist:
+            ratio = SequenceMatcher(None, norm, self.aliases[alias_id][1]).ratio()
+            score = (dice + ratio) / 2
+            if score >= min_score:
+                ranked.append(self._match(entry_id, score))
+        ranked.sort(key=lambda m: m.score, reverse=True)
+        return ranked[:limit]
+
+    def reconcile(self, keys, min_score=0.6):
+        # keys: (বিভাগ, জেলা, উপজেলা, ইউনিয়ন) টাপলের তালিকা
+        # রিটার্ন: {মূল টাপল: (ক্যানোনিকাল টাপল, [প্রতি লেভেলের স্কোর])}
+        results = {}
+        for key in keys:
+            key = tuple(key)
+            if key in results: continue
+            path, fixed, scores = (), [], []
+            for level, value in zip(LEVELS, key):
+                matches = self.suggest(value, level, scope=path, min_score=min_score) if value else []
+                top = [m for m in matches if m.score == matches[0].score]
+                if top and len({m.name for m in top}) == 1:
+                    fixed.append(top[0].name)
+                    scores.append(top[0].score)
+                    # একই নাম একাধিক এলাকায় থাকলে পরের লেভেলের জন্য শুধু কমন প্যারেন্ট রাখা হয়
+                    path = top[0].path if len(top) == 1 else path
+                else:
+                    fixed.append(value)
+                    scores.append(None)
+            results[key] = (tuple(fixed), scores)
+        return results
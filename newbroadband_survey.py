@@ -1,73 +1,41 @@
 import streamlit as st
 import pandas as pd
-import json
-import urllib.request
 from datetime import datetime
+from concurrent.futures import TimeoutError as FutureTimeoutError
 import plotly.express as px
 from streamlit_gsheets import GSheetsConnection
+from geo_data import build_bd_data, get_geo_index
+from sheet_store import get_sheet_writer
 
 # -----------------------------------------------------------------------------
 # 1. GEOGRAPHICAL DATA LOADER
 # -----------------------------------------------------------------------------
-NUHIL_RAW = {
-    "divisions": "https://raw.githubusercontent.com/nuhil/bangladesh-geocode/master/divisions/divisions.json",
-    "districts": "https://raw.githubusercontent.com/nuhil/bangladesh-geocode/master/districts/districts.json",
-    "upazilas": "https://raw.githubusercontent.com/nuhil/bangladesh-geocode/master/upazilas/upazilas.json",
-    "unions": "https://raw.githubusercontent.com/nuhil/bangladesh-geocode/master/unions/unions.json",
-}
-
-def fetch_json(url):
-    with urllib.request.urlopen(url, timeout=30) as r:
-        return json.loads(r.read().decode('utf-8'))
-
-@st.cache_data
-def build_bd_data():
-    try:
-        div_raw = fetch_json(NUHIL_RAW['divisions'])
-        dist_raw = fetch_json(NUHIL_RAW['districts'])
-        upz_raw = fetch_json(NUHIL_RAW['upazilas'])
-        uni_raw = fetch_json(NUHIL_RAW['unions'])
-        
-        def extract_data(raw):
-            if isinstance(raw, list):
-                for item in raw:
-                    if isinstance(item, dict) and 'data' in item: return item['data']
-            if isinstance(raw, dict) and 'data' in raw: return raw['data']
-            return []
-
-        divs, dists, upzs, unis = extract_data(div_raw), extract_data(dist_raw), extract_data(upz_raw), extract_data(uni_raw)
-        div_map = {str(d['id']): d.get('bn_name') or d.get('name') for d in divs}
-        dist_map = {str(d['id']): {'bn_name': d.get('bn_name') or d.get('name'), 'division_id': str(d.get('division_id'))} for d in dists}
-        upz_map = {str(u['id']): {'bn_name': u.get('bn_name') or u.get('name'), 'district_id': str(u.get('district_id'))} for u in upzs}
-        
-        uni_map = {}
-        for u in unis:
-            upid = str(u.get('upazilla_id') or u.get('upazila_id') or '')
-            uni_map.setdefault(upid, []).append(u.get('bn_name') or u.get('name'))
-
-        data_tree = {}
-        for upz_id, upz in upz_map.items():
-            dist_id = upz.get('district_id')
-            dist_entry = dist_map.get(dist_id)
-            if not dist_entry: continue
-            div_name = div_map.get(dist_entry.get('division_id'), 'অন্যান্য')
-            dist_name = dist_entry.get('bn_name')
-            upz_name = upz.get('bn_name')
-            data_tree.setdefault(div_name, {}).setdefault(dist_name, {})[upz_name] = uni_map.get(upz_id, [])
-        return data_tree
-    except:
-        return {}
-
 BD_DATA = build_bd_data()
+GEO_INDEX = get_geo_index()
 
 # -----------------------------------------------------------------------------
 # 2. UI HELPERS
 # -----------------------------------------------------------------------------
-def smart_geo_input(label, options_list, key):
+def smart_geo_input(label, options_list, key, level=None, scope=()):
     opts = ['-- নির্বাচন করুন --'] + (sorted(options_list) if options_list else []) + ['অন্যান্য']
     choice = st.selectbox(label, opts, key=key)
     if choice == 'অন্যান্য':
-        return st.text_input(f"অন্যান্য (লিখুন): {label}", key=f"{key}_other")
+        typed = st.text_input(f"অন্যান্য (লিখুন): {label}", key=f"{key}_other")
+        if not typed or not level:
+            return typed
+        # লেখা নামের সাথে মিল থাকা ক্যানোনিকাল নাম সাজেস্ট করা
+        matches = GEO_INDEX.suggest(typed, level, scope)
+        if matches and matches[0].score == 1.0:
+            return matches[0].name
+        suggestions = list(dict.fromkeys(m.name for m in matches))
+        if not suggestions:
+            return typed
+        return st.selectbox(
+            f"আপনি কি এটি বোঝাতে চেয়েছেন? ({label})",
+            [typed] + suggestions,
+            format_func=lambda x: f"{x} (যেমন লিখেছেন)" if x == typed else x,
+            key=f"{key}_suggest",
+        )
     return "" if choice == '-- নির্বাচন করুন --' else choice
 
 # -----------------------------------------------------------------------------
@@ -78,11 +46,11 @@ st.set_page_config(page_title="ব্রডব্যান্ড কভারে
 st.markdown("""
     <style>
     
-    /* 1. Main Background - White with Watermark */
+    /* 1. Main Background - White with Watermark (ইনলাইন SVG, কোনো বাইরের CDN নয়) */
     .stApp {
         background: linear-gradient(rgba(255, 255, 255, 0.9), rgba(255, 255, 255, 0.9)),
-            url('https://static.vecteezy.com/system/resources/thumbnails/072/508/275/small/a-highly-detailed-shot-of-a-server-rack-s-back-panel-showing-the-organized-chaos-of-cables-and-ports-free-photo.jpg'); 
-        background-size: cover; background-position: center; background-attachment: fixed;
+            url("data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='64' height='32'%3E%3Cpath d='M0 .5h64M0 16.5h64M8 5h20v7H8zM36 5h20v7H36zM8 21h20v7H8zM36 21h20v7H36z' fill='none' stroke='%23006400' stroke-opacity='.35'/%3E%3C/svg%3E"), #F4F7F4;
+        background-attachment: fixed;
     }
 
     /* 2. Global Text Color - Black */
@@ -265,13 +233,13 @@ def main():
     st.markdown("""
         <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 2px;">
             <div style="flex: 0 0 100px; text-align: left;">
-                <img src="https://raw.githubusercontent.com/ssdwork/bd-broadband-survey/main/Ict Division Logo Vector.svg" style="height: 70px; width: auto;" title="ICT Division">
+                <img src="app/static/ict-division-logo.svg" style="height: 70px; width: auto;" title="ICT Division">
             </div>
             <div style="flex: 1; text-align: center;">
                 <div class="main-title"> সমগ্র বাংলাদেশের ব্রডব্যান্ড কভারেজ জরিপ</div>
             </div>
             <div style="flex: 0 0 100px; text-align: right;">
-                <img src="https://raw.githubusercontent.com/ssdwork/bd-broadband-survey/main/Bangladesh_Computer_Council_Logo.svg" style="height: 45px; width: auto;" title="Bangladesh Computer Council">
+                <img src="app/static/bcc-logo.svg" style="height: 45px; width: auto;" title="Bangladesh Computer Council">
             </div>
         </div>
     """, unsafe_allow_html=True)
@@ -326,13 +294,13 @@ def main():
     g1, g2, g3 = st.columns(3)
     with g1:
         div_list = list(BD_DATA.keys())
-        final_div = smart_geo_input('বিভাগ (Division)', div_list, 'geo_div')
+        final_div = smart_geo_input('বিভাগ (Division)', div_list, 'geo_div', 'division')
     with g2:
         dist_opts = list(BD_DATA[final_div].keys()) if final_div in BD_DATA else []
-        final_dist = smart_geo_input('জেলা (District)', dist_opts, 'geo_dist')
+        final_dist = smart_geo_input('জেলা (District)', dist_opts, 'geo_dist', 'district', (final_div,))
     with g3:
         upz_opts = list(BD_DATA[final_div][final_dist].keys()) if (final_div in BD_DATA and final_dist in BD_DATA[final_div]) else []
-        final_upz = smart_geo_input('উপজেলা (Upazila)', upz_opts, 'geo_upz')
+        final_upz = smart_geo_input('উপজেলা (Upazila)', upz_opts, 'geo_upz', 'upazila', (final_div, final_dist))
 
     # Dynamic Union Section
     uni_opts = BD_DATA[final_div][final_dist][final_upz] if (final_div in BD_DATA and final_dist in BD_DATA[final_div] and final_upz in BD_DATA[final_div][final_dist]) else []
@@ -341,7 +309,7 @@ def main():
     for i in range(st.session_state.union_rows):
         ug1, ug2, ug3, ug4 = st.columns([3, 2, 2, 2])
         with ug1:
-            u_name = smart_geo_input(f'ইউনিয়ন (Union) নং {i+1}', uni_opts, f'geo_uni_{i}')
+            u_name = smart_geo_input(f'ইউনিয়ন (Union) নং {i+1}', uni_opts, f'geo_uni_{i}', 'union', (final_div, final_dist, final_upz))
         with ug2:
             u_bb = st.selectbox(f"ইউনিয়নটি কি ব্রডব্যান্ড এর আওতাভুক্ত? ({i+1}) *", ["-- নির্বাচন করুন --", "হ্যাঁ", "না"], key=f"bb_coverage_{i}")
         with ug3:
@@ -509,28 +477,21 @@ def main():
                         "উপজেলাতে ISP তথ্য": isp_final if is_first else ""
                     })
                 
-                new_record = pd.DataFrame(records_to_save)
-                
-                # ২. গুগল শিটে আপডেট পাঠানো
-                existing_data = conn.read(ttl=0)
-                if existing_data is not None and not existing_data.empty:
-                    updated_df = pd.concat([existing_data, new_record], ignore_index=True)
-                else:
-                    updated_df = new_record
-                
-                # কলামের অর্ডার ঠিক রাখা (যাতে নতুন কলাম সঠিক জায়গায় বসে)
-                expected_order = [
-                    "Timestamp", "নাম", "কর্মকর্তার যোগাযোগ নম্বর", "পদবী", "কর্মস্থল", 
-                    "বিভাগ", "জেলা", "উপজেলা", "ইউনিয়ন", 
-                    "উপজেলাতে বিদ্যমান NTTN", "ইউনিয়নে বিদ্যমান NTTN", 
-                    "ব্রডব্যান্ড আওতাভুক্ত", "মোট গ্রাম", "আওতাভুক্ত গ্রাম", 
-                    "ISP মোট সংখ্যা", "উপজেলাতে ISP তথ্য"
-                ]
-                # ডাটাফ্রেমে থাকা অন্যান্য কলামগুলো (যদি থাকে) শেষে যোগ করা
-                final_columns = [c for c in expected_order if c in updated_df.columns] + [c for c in updated_df.columns if c not in expected_order]
-                updated_df = updated_df[final_columns]
-
-                conn.update(data=updated_df)
+                # ২. গুগল শিটে আপডেট পাঠানো — অন্য সেশনের সাবমিশনের সাথে একটি ব্যাচে
+                # যোগ হয়ে যায়; rate limit (429) এলে রাইটার নিজেই backoff করে আবার চেষ্টা করে
+                writer = get_sheet_writer(conn)
+                pending = writer.submit(records_to_save)
+                try:
+                    pending.result(timeout=300)
+                except FutureTimeoutError:
+                    # এখনো পাঠানো শুরু না হলে বাফার থেকে সরিয়ে নেওয়া হয়, তাই আবার Submit করলে ডুপ্লিকেট হবে না
+                    if writer.withdraw(pending):
+                        raise RuntimeError("গুগল শিট এখন ব্যস্ত, তথ্য জমা হয়নি। কিছুক্ষণ পরে আবার Submit করুন।")
+                    if not pending.done():
+                        # ব্যাচটি ইতিমধ্যে শিটে লেখা হচ্ছে — আবার Submit করলে একই তথ্য দুবার জমা হবে
+                        st.warning("⏳ আপনার তথ্য জমা হওয়ার প্রক্রিয়ায় আছে (গুগল শিটের কোটার কারণে দেরি হচ্ছে)। অনুগ্রহ করে আবার Submit করবেন না।")
+                        st.stop()
+                    pending.result()
                 
                 
                 # ৩. ইউজার ফিডব্যাক
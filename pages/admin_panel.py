@@ -3,6 +3,11 @@ import pandas as pd
 from streamlit_gsheets import GSheetsConnection
 import plotly.express as px
 from datetime import datetime
+from geo_data import get_geo_index, get_coverage_index
+from sheet_store import (get_sheet_writer, get_snapshot, get_rollups, get_change_feed, get_worksheet,
+                         deliver_changes, read_sheet, cell_updates)
+from rollups import METRICS
+from snapshot import StaleSnapshotError, assert_rows_unchanged
 
 # পেজ সেটআপ
 st.set_page_config(page_title="Admin Panel - Broadband Survey", layout="wide")
@@ -10,6 +15,11 @@ st.set_page_config(page_title="Admin Panel - Broadband Survey", layout="wide")
 # গুগল শিট কানেকশন
 conn = st.connection("gsheets", type=GSheetsConnection)
 
+@st.cache_data(max_entries=4, show_spinner="নাম মিলানো হচ্ছে...")
+def scan_reconciliation(generation, rows, min_score, _keys):
+    # _keys হ্যাশ করা হয় না — একই স্ন্যাপশট generation ও রো সংখ্যা মানেই একই কী-সেট
+    return get_geo_index().reconcile(set(_keys), min_score=min_score)
+
 # হেডার ও হোমে ফেরার বাটন
 c1, c2 = st.columns([5, 1])
 with c1:
@@ -25,8 +35,17 @@ if pwd == 'Bccadmin2025':
     st.sidebar.success('Authenticated')
     
     try:
-        # ডাটা রিড করা
-        df_admin = conn.read(ttl="0")
+        # ডাটা রিড করা — লাইভ শিট নয়, ব্যাকগ্রাউন্ডে মিরর করা লোকাল স্ন্যাপশট থেকে
+        snapshot = get_snapshot(conn)
+        df_admin = snapshot.load()
+
+        snapshot_age = snapshot.age()
+        st.sidebar.caption(f"ডাটা স্ন্যাপশট: {int(snapshot_age)} সেকেন্ড আগের" if snapshot_age is not None else "ডাটা স্ন্যাপশট: —")
+        if snapshot.error:
+            st.sidebar.warning(f"সর্বশেষ সিঙ্ক ব্যর্থ: {snapshot.error}")
+        if st.sidebar.button("🔄 Refresh Data"):
+            snapshot.sync_once()
+            st.rerun()
         
         if df_admin is None or df_admin.empty:
             st.info("জরিপের কোনো তথ্য এখনো জমা পড়েনি।")
@@ -50,13 +69,26 @@ if pwd == 'Bccadmin2025':
             st.markdown("---")
             st.markdown("### 📊 সামগ্রিক পরিসংখ্যান (National Progress)")
             
-            TOTAL_UPAZILAS = 495
-            TOTAL_UNIONS = 4554
-            
-            submitted_upazilas = df_admin['উপজেলা'].nunique()
+            # জিওকোড ট্রি থেকে বানানো কভারেজ ইনডেক্স — শুধু নতুন রোগুলো যোগ হয়, শিটে
+            # কোনো এডিট/ডিলিট হলে (স্ন্যাপশটের generation বদলালে) নতুন করে বানানো হয়
+            geo_cols = ['বিভাগ', 'জেলা', 'উপজেলা', 'ইউনিয়ন']
+            geo_keys = df_admin[geo_cols].fillna('').astype(str)
+            coverage = get_coverage_index()
+            coverage.sync(geo_keys.values.tolist(), df_admin.attrs.get('generation'))
+
+            if coverage.total_upazilas:
+                TOTAL_UPAZILAS = coverage.total_upazilas
+                TOTAL_UNIONS = coverage.total_unions
+                submitted_upazilas = coverage.submitted_upazilas
+                submitted_unions = coverage.submitted_unions
+            else:
+                # জিওকোড ডাটা লোড না হলে আগের মতো আনুমানিক হিসাব
+                TOTAL_UPAZILAS = 495
+                TOTAL_UNIONS = 4554
+                submitted_upazilas = df_admin['উপজেলা'].nunique()
+                submitted_unions = df_admin['ইউনিয়ন'].nunique()
+
             remaining_upazilas = max(0, TOTAL_UPAZILAS - submitted_upazilas)
-            
-            submitted_unions = df_admin['ইউনিয়ন'].nunique()
             remaining_unions = max(0, TOTAL_UNIONS - submitted_unions)
             
             m1, m2, m3, m4 = st.columns(4)
@@ -86,6 +118,35 @@ if pwd == 'Bccadmin2025':
                 fig_uni.add_annotation(text=f"{int((submitted_unions/TOTAL_UNIONS)*100)}%", showarrow=False, font_size=20)
                 st.plotly_chart(fig_uni, use_container_width=True)
 
+            # ৩.১ কভারেজ গ্যাপ রিপোর্ট (কোন উপজেলা/ইউনিয়ন এখনো বাকি)
+            if coverage.total_upazilas:
+                st.markdown("---")
+                st.markdown("### 🗺️ Coverage Gap Report")
+                if coverage.unknown:
+                    st.warning(f"জিওকোড তালিকার সাথে মেলেনি এমন {len(coverage.unknown)} টি এন্ট্রি আছে — নিচের Reconcile অপশন দিয়ে ঠিক করুন।")
+
+                gap_div = div_search if div_search != "All" else None
+                gap_summary = pd.DataFrame(coverage.district_summary(gap_div),
+                                           columns=['বিভাগ', 'জেলা', 'মোট উপজেলা', 'বাকি উপজেলা', 'মোট ইউনিয়ন', 'বাকি ইউনিয়ন'])
+                gap_summary = gap_summary.sort_values(['বাকি উপজেলা', 'বাকি ইউনিয়ন'], ascending=False)
+                st.dataframe(gap_summary, use_container_width=True, hide_index=True)
+
+                gap_c1, gap_c2 = st.columns(2)
+                with gap_c1:
+                    gap_dist_list = ["All"] + sorted(gap_summary['জেলা'].unique().tolist())
+                    gap_dist = st.selectbox("জেলা নির্বাচন (বাকি তালিকা দেখতে)", gap_dist_list)
+                gap_dist = gap_dist if gap_dist != "All" else None
+
+                missing_upz = pd.DataFrame(coverage.missing_upazilas(gap_div, gap_dist), columns=geo_cols[:3])
+                missing_uni = pd.DataFrame(coverage.missing_unions(gap_div, gap_dist), columns=geo_cols)
+                gap_t1, gap_t2 = st.columns(2)
+                with gap_t1:
+                    st.write(f"**বাকি উপজেলা ({len(missing_upz)})**")
+                    st.dataframe(missing_upz, use_container_width=True, hide_index=True)
+                with gap_t2:
+                    st.write(f"**বাকি ইউনিয়ন ({len(missing_uni)})**")
+                    st.dataframe(missing_uni, use_container_width=True, hide_index=True)
+
             # ৪. চার্টগুলো 
             st.markdown("---")
             g1, g2 = st.columns(2)
@@ -119,20 +180,120 @@ if pwd == 'Bccadmin2025':
                              color_discrete_sequence=['#00D487'])
             st.plotly_chart(fig_isp, use_container_width=True)
 
+            # ৪.১ সময়ের সাথে অগ্রগতি (ঘণ্টা/দিন ভিত্তিক রোলআপ থেকে)
+            st.markdown("---")
+            st.markdown("### 📈 Progress Over Time")
+            rollups = get_rollups()
+            rollups.sync(df_admin, df_admin.attrs.get('generation'))
+
+            t1, t2 = st.columns(2)
+            with t1:
+                freq_label = st.radio("সময়ের একক", ["দৈনিক", "ঘণ্টাভিত্তিক"], horizontal=True)
+            with t2:
+                trend_metric = st.selectbox("মেট্রিক", METRICS)
+
+            trend_div = div_search if div_search != "All" else None
+            trend = rollups.frame('day' if freq_label == "দৈনিক" else 'hour', trend_div)
+            if trend.empty:
+                st.info("Timestamp সহ কোনো এন্ট্রি পাওয়া যায়নি।")
+            else:
+                # একটি বিভাগ ফিল্টার করলে জেলা অনুযায়ী, নাহলে বিভাগ অনুযায়ী দেখানো
+                group_col = 'জেলা' if trend_div else 'বিভাগ'
+                cumulative_col = f"{trend_metric} (ক্রমযোজিত)"
+                trend = trend.groupby(['সময়', group_col])[trend_metric].sum().reset_index()
+                trend[cumulative_col] = trend.groupby(group_col)[trend_metric].cumsum()
+
+                tc1, tc2 = st.columns(2)
+                with tc1:
+                    st.write(f"**{cumulative_col}**")
+                    st.plotly_chart(px.line(trend, x='সময়', y=cumulative_col, color=group_col, markers=True),
+                                    use_container_width=True)
+                with tc2:
+                    st.write(f"**প্রতি {'দিনে' if freq_label == 'দৈনিক' else 'ঘণ্টায়'} {trend_metric}**")
+                    st.plotly_chart(px.bar(trend, x='সময়', y=trend_metric, color=group_col),
+                                    use_container_width=True)
+
             # ৫. টেবিল প্রদর্শন 
             st.subheader("📋 Data Records")
             st.dataframe(filtered_df, use_container_width=True)
 
-            # ৬. ডিলিট লজিক 
+            # ৬. "অন্যান্য" নাম মিলানো (ফাজি ইনডেক্স দিয়ে এক ব্যাচে)
+            st.markdown("---")
+            with st.expander("🧭 Reconcile Free-text Geo Names"):
+                min_score = st.slider("ন্যূনতম মিলের স্কোর (Min Match Score)", 0.5, 1.0, 0.75, 0.05)
+                # বাল্ক মিলানো ভারী (২০০০ রো-তে ~১ সেকেন্ড) আর expander বন্ধ থাকলেও চলে — তাই প্রতি
+                # রিরানে নয়, শুধু Scan চাপলে; ফলাফল স্ন্যাপশট ও স্কোর অনুযায়ী ক্যাশ থাকে
+                scan_key = (df_admin.attrs.get('generation'), len(df_admin), min_score)
+                if st.button("🔍 Scan"):
+                    st.session_state['reconcile_scan'] = scan_key
+                if st.session_state.get('reconcile_scan') != scan_key:
+                    st.info("নাম মিলানো শুরু করতে Scan চাপুন (নতুন ডাটা এলে বা স্কোর বদলালে আবার Scan করতে হবে)।")
+                else:
+                    reconciled = scan_reconciliation(*scan_key, _keys=map(tuple, geo_keys.values.tolist()))
+                    fixed_keys = pd.DataFrame([reconciled[tuple(r)][0] for r in geo_keys.values.tolist()],
+                                              index=geo_keys.index, columns=geo_cols)
+                    changed = (fixed_keys != geo_keys).any(axis=1)
+
+                    if not changed.any():
+                        st.success("সব এন্ট্রির নাম ইতিমধ্যে জিওকোড তালিকার সাথে মিলে আছে।")
+                    else:
+                        st.write(f"**{int(changed.sum())} টি রো সংশোধন করা যাবে:**")
+                        preview = pd.concat([geo_keys[changed].add_suffix(' (আগে)'), fixed_keys[changed].add_suffix(' (পরে)')], axis=1)
+                        st.dataframe(preview, use_container_width=True)
+                        if st.button("Apply Reconciliation", type="primary"):
+                            # স্ন্যাপশট শুধু পড়ার জন্য; লেখার সময় লাইভ শিটের উপরেই পরিবর্তন করা হয়
+                            fix_index = changed[changed].index
+                            def apply_reconciliation():
+                                sheet = get_worksheet(conn)
+                                live_df = read_sheet(sheet)
+                                # স্ন্যাপশটের পরে কেউ রো ডিলিট/এডিট করে থাকলে ভুল রো-তে লেখা হবে — তাই আগে যাচাই
+                                assert_rows_unchanged(live_df, df_admin, fix_index, geo_cols)
+                                before_rows = live_df.loc[fix_index].to_dict('records')
+                                # শুধু বদলানো ঘরগুলো একটি batch_update রিকোয়েস্টে — হয় সব লেখা হয়, নয়তো কিছুই না
+                                sheet.batch_update(cell_updates(list(live_df.columns), fix_index,
+                                                                fixed_keys.loc[fix_index].to_dict('records')),
+                                                   value_input_option="USER_ENTERED")
+                                live_df.loc[fix_index, geo_cols] = fixed_keys.loc[fix_index]
+                                get_change_feed(conn).enqueue("update", live_df.loc[fix_index].to_dict('records'),
+                                                              row_indexes=list(fix_index), before=before_rows)
+                            try:
+                                get_sheet_writer(conn).run_exclusive(apply_reconciliation)
+                                deliver_changes(get_sheet_writer(conn), get_change_feed(conn))
+                            except StaleSnapshotError as e:
+                                snapshot.request_refresh()
+                                st.error(f"স্ন্যাপশটের পরে শিট বদলে গেছে ({e})। কিছুই লেখা হয়নি — 🔄 Refresh Data চেপে আবার চেষ্টা করুন।")
+                            else:
+                                snapshot.sync_once()
+                                st.cache_data.clear()
+                                st.success(f"{int(changed.sum())} rows reconciled successfully!")
+                                st.rerun()
+
+            # ৭. ডিলিট লজিক 
             st.markdown("---")
             with st.expander("🗑️ Delete Data Entry"):
                 delete_index = st.number_input("Enter Row Index to delete:", min_value=0, max_value=max(0, len(df_admin)-1), step=1)
                 if st.button("Confirm Delete", type="primary"):
-                    df_admin = df_admin.drop(df_admin.index[delete_index])
-                    conn.update(data=df_admin)
-                    st.cache_data.clear()
-                    st.success(f"Row {delete_index} deleted successfully!")
-                    st.rerun()
+                    # রো চেনার জন্য যে কলামগুলো মিলিয়ে দেখা হয়
+                    identity_cols = [c for c in ['Timestamp', 'নাম'] + geo_cols if c in df_admin.columns]
+                    def delete_row():
+                        sheet = get_worksheet(conn)
+                        live_df = read_sheet(sheet)
+                        assert_rows_unchanged(live_df, df_admin, [delete_index], identity_cols)
+                        deleted_row = live_df.iloc[delete_index].to_dict()
+                        # রো ১ হেডার, তাই ডাটা রো পজিশন + 2 — একটি অ্যাটমিক deleteDimension রিকোয়েস্ট
+                        sheet.delete_rows(int(delete_index) + 2)
+                        get_change_feed(conn).enqueue("delete", [deleted_row], row_indexes=[delete_index])
+                    try:
+                        get_sheet_writer(conn).run_exclusive(delete_row)
+                        deliver_changes(get_sheet_writer(conn), get_change_feed(conn))
+                    except StaleSnapshotError as e:
+                        snapshot.request_refresh()
+                        st.error(f"স্ন্যাপশটের পরে শিট বদলে গেছে ({e})। কিছুই ডিলিট হয়নি — 🔄 Refresh Data চেপে আবার চেষ্টা করুন।")
+                    else:
+                        snapshot.sync_once()
+                        st.cache_data.clear()
+                        st.success(f"Row {delete_index} deleted successfully!")
+                        st.rerun()
 
     except Exception as e:
         st.error(f"Error loading admin data: {e}")
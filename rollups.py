@@ -0,0 +1,79 @@
+import threading
+from datetime import datetime
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# SUBMISSION TIME-SERIES ROLLUPS
+# প্রতিটি রো-এর Timestamp ধরে ঘণ্টা ও দিন ভিত্তিক (বিভাগ, জেলা) বাকেটে সাবমিশন,
+# নতুন কভার হওয়া ইউনিয়ন, আওতাভুক্ত গ্রাম ও ISP সংখ্যা জমা রাখা হয়। নতুন রো
+# append হলে শুধু সেই রোগুলোই যোগ হয় — পুরো ইতিহাস আবার হিসাব করা হয় না।
+# -----------------------------------------------------------------------------
+# Timestamp ("%Y-%m-%d %H:%M:%S") এর প্রথম কত অক্ষর বাকেট নির্ধারণ করে
+FREQS = {'hour': 13, 'day': 10}
+METRICS = ['সাবমিশন', 'নতুন ইউনিয়ন', 'আওতাভুক্ত গ্রাম', 'ISP']
+
+def _number(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0
+    return 0 if number != number else number    # NaN
+
+def _text(value):
+    return '' if value is None or value != value else str(value)    # None / NaN
+
+class SubmissionRollups:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.buckets = {freq: {} for freq in FREQS}   # freq -> {(সময়, বিভাগ, জেলা): [metrics...]}
+            self.seen_submissions = set()                 # (Timestamp, নাম, যোগাযোগ নম্বর)
+            self.seen_unions = set()                      # (বিভাগ, জেলা, উপজেলা, ইউনিয়ন)
+            self.rows = 0
+            self.generation = None
+
+    def add(self, row):
+        ts = _text(row.get('Timestamp'))
+        try:
+            datetime.fromisoformat(ts)
+        except ValueError:
+            return
+        div, dist = _text(row.get('বিভাগ')), _text(row.get('জেলা'))
+
+        # একটি ফর্ম সাবমিশনে একাধিক ইউনিয়নের রো থাকে — একই Timestamp/নাম/নম্বর মানে একই সাবমিশন
+        submission_key = (ts, _text(row.get('নাম')), _text(row.get('কর্মকর্তার যোগাযোগ নম্বর')))
+        new_submission = submission_key not in self.seen_submissions
+        self.seen_submissions.add(submission_key)
+
+        union_key = (div, dist, _text(row.get('উপজেলা')), _text(row.get('ইউনিয়ন')))
+        new_union = bool(union_key[3]) and union_key not in self.seen_unions
+        self.seen_unions.add(union_key)
+
+        delta = (int(new_submission), int(new_union), _number(row.get('আওতাভুক্ত গ্রাম')), _number(row.get('ISP মোট সংখ্যা')))
+        for freq, width in FREQS.items():
+            bucket = self.buckets[freq].setdefault((ts[:width], div, dist), [0, 0, 0, 0])
+            for i, value in enumerate(delta):
+                bucket[i] += value
+
+    def sync(self, df, generation):
+        # শুধু আগের high-water mark এর পরের রোগুলো পড়া হয়। generation: স্ন্যাপশটের edit
+        # generation (df.attrs["generation"]) — বদলালে মাঝের কোনো রো এডিট/ডিলিট হয়েছে, তাই নতুন করে বানানো হয়
+        with self._lock:
+            if generation is None or generation != self.generation or len(df) < self.rows:
+                self.reset()
+                self.generation = generation
+            for row in df.iloc[self.rows:].to_dict('records'):
+                self.add(row)
+            self.rows = len(df)
+
+    def frame(self, freq='day', division=None):
+        # চার্টের জন্য লং-ফরম্যাট টেবিল: সময়, বিভাগ, জেলা, METRICS...
+        with self._lock:
+            rows = [(t, div, dist, *values) for (t, div, dist), values in self.buckets[freq].items()
+                    if not division or div == division]
+        df = pd.DataFrame(rows, columns=['সময়', 'বিভাগ', 'জেলা'] + METRICS)
+        df['সময়'] = pd.to_datetime(df['সময়'], format='%Y-%m-%d %H' if freq == 'hour' else '%Y-%m-%d')
+        return df.sort_values('সময়', ignore_index=True)
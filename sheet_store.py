@@ -0,0 +1,146 @@
+import logging
+import re
+from collections import namedtuple
+import streamlit as st
+import pandas as pd
+from gspread.exceptions import WorksheetNotFound
+from gspread.utils import rowcol_to_a1
+from batch_writer import BatchedSheetWriter, MeteredWorksheet, QuotaBudget
+from snapshot import SnapshotSync
+from rollups import SubmissionRollups
+from change_feed import SheetChangeFeed
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# GOOGLE SHEET ACCESS — ব্যাচড write ও লোকাল স্ন্যাপশট (ফর্ম ও অ্যাডমিন প্যানেল দুই জায়গাতেই ব্যবহৃত)
+# -----------------------------------------------------------------------------
+# কলামের অর্ডার ঠিক রাখা (যাতে নতুন কলাম সঠিক জায়গায় বসে)
+SHEET_COLUMNS = [
+    "Timestamp", "নাম", "কর্মকর্তার যোগাযোগ নম্বর", "পদবী", "কর্মস্থল",
+    "বিভাগ", "জেলা", "উপজেলা", "ইউনিয়ন",
+    "উপজেলাতে বিদ্যমান NTTN", "ইউনিয়নে বিদ্যমান NTTN",
+    "ব্রডব্যান্ড আওতাভুক্ত", "মোট গ্রাম", "আওতাভুক্ত গ্রাম",
+    "ISP মোট সংখ্যা", "উপজেলাতে ISP তথ্য"
+]
+
+# Google Sheets API: প্রতি ইউজার/প্রজেক্টে প্রতি মিনিটে ৬০টি read ও ৬০টি write রিকোয়েস্ট
+READ_QUOTA_PER_MINUTE = 60
+WRITE_QUOTA_PER_MINUTE = 60
+
+Quota = namedtuple('Quota', ['read', 'write'])
+
+def sheet_frame(values):
+    # get_all_values() এর ফলাফল (প্রথম রো হেডার) থেকে DataFrame; খালি ঘর None
+    if not values:
+        return pd.DataFrame()
+    return pd.DataFrame(values[1:], columns=values[0]).replace({'': None})
+
+def read_sheet(worksheet):
+    # পুরো শিট একটি read রিকোয়েস্টে
+    return sheet_frame(worksheet.get_all_values())
+
+def sheet_values(columns, rows):
+    # dict রো থেকে হেডারের ক্রমে ঘরের মান; None/NaN খালি ঘর
+    return [['' if row.get(c) is None or row.get(c) != row.get(c) else row.get(c) for c in columns] for row in rows]
+
+def cell_updates(columns, positions, rows):
+    # (ডাটা রো পজিশন, {কলাম: মান}) থেকে batch_update এর রেঞ্জ — রো ১ হেডার, তাই শিটের রো = পজিশন + 2
+    return [{'range': rowcol_to_a1(position + 2, columns.index(column) + 1), 'values': sheet_values([column], [row])}
+            for position, row in zip(positions, rows) for column in row]
+
+# append রেসপন্সের updatedRange (যেমন "'Sheet1'!A5:P7") থেকে প্রথম রো নম্বর
+APPENDED_RANGE = re.compile(r"!\$?[A-Z]+\$?(\d+)")
+
+def deliver_changes(writer, feed):
+    # outbox এ জমা চেঞ্জ ইভেন্ট writer এর লক ও retry/backoff দিয়ে ফিড ট্যাবে পাঠানো। তবুও ব্যর্থ হলে ইভেন্টগুলো
+    # outbox এই থাকে এবং পরের ফ্লাশে আবার পাঠানো হয়; এখানে শুধু লগ করা হয় — শিটের রো ইতিমধ্যে লেখা হয়ে গেছে,
+    # ইউজার "ব্যর্থ" দেখলে আবার সাবমিট করত আর শিটে ডুপ্লিকেট রো হতো
+    try:
+        writer.run_exclusive(feed.deliver)
+    except Exception:
+        logger.exception("change feed: %d event(s) kept in the outbox for the next flush", feed.pending())
+
+def gsheets_appender(worksheet, feed=None):
+    # প্রতি ব্যাচে দুটি API রিকোয়েস্ট: হেডার রো পড়া + একটি values.append। append অ্যাটমিক — 429 বা
+    # অন্য ত্রুটিতে কিছুই লেখা হয় না, তাই writer আবার চেষ্টা করলে রো হারায় বা ডুপ্লিকেট হয় না
+    def append(rows):
+        header = worksheet.row_values(1)
+        columns = header or SHEET_COLUMNS
+        unknown = sorted({c for row in rows for c in row} - set(columns))
+        if unknown:
+            raise ValueError(f"columns not in the sheet header: {unknown}")
+        values = sheet_values(columns, rows)
+        if not header:
+            values.insert(0, list(columns))
+        # USER_ENTERED: আগের set_with_dataframe এর মতো সংখ্যা/তারিখ শিটে পার্স হয়
+        response = worksheet.append_rows(values, value_input_option="USER_ENTERED", table_range="A1")
+        first_row = int(APPENDED_RANGE.search(response['updates']['updatedRange']).group(1))
+        # শিটে সফলভাবে লেখার পরেই চেঞ্জ ফিডের outbox এ insert ইভেন্ট (ডাটা রো পজিশন = শিটের রো - 2);
+        # ফিড ট্যাবে পাঠানো হয় ফ্লাশের পরে, deliver_changes দিয়ে
+        if feed is not None:
+            start = first_row - 2 + (0 if header else 1)
+            feed.enqueue("insert", rows, row_indexes=range(start, start + len(rows)))
+    return append
+
+@st.cache_resource
+def get_quota():
+    # সব সেশন ও সব ট্যাব মিলে একটিই read ও write কোটার হিসাব
+    return Quota(QuotaBudget(limit=READ_QUOTA_PER_MINUTE, period=60.0),
+                 QuotaBudget(limit=WRITE_QUOTA_PER_MINUTE, period=60.0))
+
+@st.cache_resource
+def get_worksheet(_conn, title=None):
+    # GSheetsConnection.update() আসলে clear + resize + লেখা (একাধিক রিকোয়েস্ট), তাই মাঝপথে ব্যর্থ হলে
+    # শিট খালি থেকে যেতে পারে। একক অ্যাটমিক রিকোয়েস্টের (append_rows, delete_rows, batch_update)
+    # জন্য এর ভিতরের gspread ওয়ার্কশিট ব্যবহার করা হয়। title না দিলে প্রথম ট্যাব (conn.read() এর মতো)
+    quota = get_quota()
+    quota.read.acquire()
+    spreadsheet = _conn.client._open_spreadsheet()
+    if title is None:
+        worksheet = spreadsheet.get_worksheet(0)
+    else:
+        try:
+            worksheet = spreadsheet.worksheet(title)
+        except WorksheetNotFound:
+            quota.write.acquire()
+            worksheet = spreadsheet.add_worksheet(title, rows=1000, cols=26)
+    return MeteredWorksheet(worksheet, quota.read, quota.write)
+
+# ডাউনস্ট্রিম টিমের জন্য append-only চেঞ্জ লগ (change_feed_consumer.py দেখুন)। Streamlit Cloud এ
+# লোকাল ডিস্ক প্রতি রিবুটে মুছে যায়, তাই লগটি একই স্প্রেডশিটের এই ট্যাবে রাখা হয়
+CHANGE_FEED_WORKSHEET = "changes"
+
+@st.cache_resource
+def get_change_feed(_conn):
+    return SheetChangeFeed(get_worksheet(_conn, CHANGE_FEED_WORKSHEET))
+
+# লোকাল স্ন্যাপশট কত সেকেন্ড পরপর শিট থেকে মিরর হবে; সাবমিশনের পরের রিফ্রেশ অন্তত কত সেকেন্ড পরপর
+SNAPSHOT_PATH = ".snapshot/survey.arrow"
+SNAPSHOT_INTERVAL = 30.0
+SNAPSHOT_MIN_GAP = 10.0
+
+@st.cache_resource
+def get_snapshot(_conn):
+    # অ্যাডমিন অ্যানালিটিক্সের জন্য ব্যাকগ্রাউন্ডে চলা একটিই সিঙ্ক ওয়ার্কার। শিট পড়া writer এর লক নিয়ে
+    # চলে, তাই চলমান ফ্লাশ/ডিলিট/রিকনসাইলের মাঝখানের অবস্থা কখনো মিরর হয় না
+    writer = get_sheet_writer(_conn)
+    worksheet = get_worksheet(_conn)
+    snapshot = SnapshotSync(lambda: writer.run_exclusive(read_sheet, worksheet), path=SNAPSHOT_PATH,
+                            interval=SNAPSHOT_INTERVAL, min_gap=SNAPSHOT_MIN_GAP).start()
+    writer.flush_hooks.append(snapshot.request_refresh)
+    return snapshot
+
+@st.cache_resource
+def get_rollups():
+    # ঘণ্টা/দিন ভিত্তিক রোলআপ — স্ন্যাপশটের নতুন রোগুলো দিয়ে ধাপে ধাপে আপডেট হয়
+    return SubmissionRollups()
+
+@st.cache_resource
+def get_sheet_writer(_conn):
+    # সব সেশনের সাবমিশন একটিই রাইটারের মাধ্যমে ব্যাচ করে পাঠানো হয়। ওয়ার্কশিটের প্রতিটি রিকোয়েস্ট
+    # কোটা থেকে গোনা হয়, তাই writer এর নিজের budget নেই
+    feed = get_change_feed(_conn)
+    writer = BatchedSheetWriter(gsheets_appender(get_worksheet(_conn), feed), window=2.0)
+    writer.flush_hooks.append(lambda: deliver_changes(writer, feed))
+    return writer
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import pandas as pd
+import pyarrow as pa
+
+# -----------------------------------------------------------------------------
+# LOCAL SNAPSHOT REPLICA
+# ব্যাকগ্রাউন্ড থ্রেড নির্দিষ্ট সময় পরপর গুগল শিট পড়ে একটি লোকাল Arrow (IPC)
+# ফাইলে মিরর করে রাখে। অ্যাডমিন ড্যাশবোর্ডের সব read-only অ্যানালিটিক্স এই ফাইল
+# memory-map করে পড়ে, ফলে ড্যাশবোর্ড গুগল API-এর ল্যাটেন্সি বা কোটার উপর নির্ভর করে না।
+# -----------------------------------------------------------------------------
+def _to_arrow(df):
+    # শিটের কলামে সংখ্যা ও খালি স্ট্রিং মিশে থাকে, তাই সব কলাম string হিসেবে রাখা হয়
+    columns = {str(c): pa.array([None if pd.isna(v) else str(v) for v in df[c]], type=pa.string())
+               for c in df.columns}
+    return pa.table(columns)
+
+def _digest(columns, row_hashes):
+    # কলামের নাম ও প্রতিটি রো-এর হ্যাশ মিলিয়ে পুরো ফ্রেমের কনটেন্ট হ্যাশ
+    digest = hashlib.sha256(json.dumps(list(columns), ensure_ascii=False).encode("utf-8"))
+    digest.update(row_hashes.tobytes())
+    return digest.hexdigest()
+
+def normalize_row(values):
+    # স্ন্যাপশটে যেভাবে রাখা হয় (string / None) সেভাবে একটি রো-এর মান
+    return [None if pd.isna(v) else str(v) for v in values]
+
+class StaleSnapshotError(RuntimeError):
+    pass
+
+def assert_rows_unchanged(live_df, snapshot_df, positions, columns):
+    # স্ন্যাপশট দেখে ঠিক করা রো লাইভ শিটের সেই পজিশনে এখনো একই আছে কিনা যাচাই
+    # (এর মধ্যে অন্য কেউ রো ডিলিট/এডিট করলে ভুল রো-তে লেখা এড়াতে)
+    for position in positions:
+        if position >= len(live_df) or any(c not in live_df.columns for c in columns):
+            raise StaleSnapshotError(f"row {position} no longer exists in the sheet")
+        live = normalize_row(live_df.iloc[position][columns])
+        expected = normalize_row(snapshot_df.iloc[position][columns])
+        if live != expected:
+            raise StaleSnapshotError(f"row {position} changed in the sheet since the snapshot was taken")
+
+class SnapshotSync:
+    def __init__(self, read_fn, path=".snapshot/survey.arrow", interval=30.0, min_gap=0.0):
+        # read_fn(): পুরো শিট DataFrame হিসেবে ফেরত দেয় (যেমন sheet_store.read_sheet)
+        # min_gap: request_refresh() যত ঘনঘনই আসুক, দুটি ব্যাকগ্রাউন্ড সিঙ্কের মাঝে অন্তত এত সেকেন্ড
+        self.read_fn = read_fn
+        self.path = path
+        self.meta_path = os.path.splitext(path)[0] + ".meta.json"
+        self.interval = interval
+        self.min_gap = min_gap
+        self.error = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._cached = (None, None)     # (ফাইলের mtime, DataFrame)
+        self.high_water = self._load_meta()
+
+    def _load_meta(self):
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"rows": 0, "digest": None, "generation": 0, "synced_at": None}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="snapshot-sync", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            started = time.monotonic()
+            try:
+                self.sync_once()
+            except Exception as e:
+                self.error = e
+            self._wake.wait(self.interval)
+            # প্রতিটি ব্যাচ ফ্লাশের পর রিফ্রেশ অনুরোধ আসে — min_gap এর মধ্যে আসা সব অনুরোধ একটি সিঙ্কে মিলে যায়
+            time.sleep(max(0.0, self.min_gap - (time.monotonic() - started)))
+            self._wake.clear()
+
+    def request_refresh(self):
+        # write (সাবমিট/ডিলিট) এর পর পরবর্তী সিঙ্ক এখনই চালানোর জন্য
+        self._wake.set()
+
+    def sync_once(self):
+        with self._lock:
+            df = self.read_fn()
+            if df is None:
+                df = pd.DataFrame()
+            table = _to_arrow(df)
+            row_hashes = pd.util.hash_pandas_object(table.to_pandas(), index=False).to_numpy()
+            digest = _digest(table.column_names, row_hashes)
+
+            # পুরো ফ্রেমের কনটেন্ট হ্যাশ না বদলালে ফাইল আবার লেখার দরকার নেই
+            old_rows, old_digest = self.high_water.get("rows") or 0, self.high_water.get("digest")
+            generation = self.high_water.get("generation") or 0
+            changed = digest != old_digest or not os.path.exists(self.path)
+            if changed:
+                # আগের রোগুলো হুবহু একই থাকলে (শুধু append) generation একই থাকে; মাঝের কোনো
+                # রো এডিট/ডিলিট হলে generation বাড়ে, ফলে ইনক্রিমেন্টাল কনজিউমাররা নতুন করে বানায়
+                appended = len(row_hashes) >= old_rows and _digest(table.column_names, row_hashes[:old_rows]) == old_digest
+                if not appended:
+                    generation += 1
+                table = table.replace_schema_metadata({"generation": str(generation)})
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = self.path + ".tmp"
+                with pa.OSFile(tmp_path, "wb") as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+                os.replace(tmp_path, self.path)
+
+            self.high_water = {"rows": len(row_hashes), "digest": digest, "generation": generation, "synced_at": time.time()}
+            tmp_meta = self.meta_path + ".tmp"
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump(self.high_water, f, ensure_ascii=False)
+            os.replace(tmp_meta, self.meta_path)
+            self.error = None
+            return changed
+
+    def age(self):
+        synced_at = self.high_water.get("synced_at")
+        return None if synced_at is None else time.time() - synced_at
+
+    def load(self):
+        # স্ন্যাপশট না থাকলে (প্রথম চালু) একবার সিঙ্ক্রোনাসলি মিরর করা।
+        # df.attrs["generation"]: এই ফ্রেমের generation — কভারেজ/রোলআপের sync() এ পাঠাতে হয়
+        if not os.path.exists(self.path):
+            self.sync_once()
+        mtime = os.stat(self.path).st_mtime_ns
+        cached_mtime, cached_df = self._cached
+        if cached_mtime == mtime:
+            return cached_df.copy()
+        with pa.memory_map(self.path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        df = table.to_pandas()
+        generation = (table.schema.metadata or {}).get(b"generation")
+        df.attrs["generation"] = int(generation) if generation is not None else None
+        self._cached = (mtime, df)
+        return df.copy()
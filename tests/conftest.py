@@ -0,0 +1,5 @@
+import os
+import sys
+
+# টেস্টগুলো রিপোর রুট থেকে মডিউল ইমপোর্ট করে (batch_writer, change_feed ইত্যাদি)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,247 @@
+import json
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# -----------------------------------------------------------------------------
+# FAKE SHEETS SERVER
+# লোকাল HTTP সার্ভার যা গুগল শিটের মতো প্রতি period সেকেন্ডে সর্বোচ্চ read_limit টি read ও
+# write_limit টি write রিকোয়েস্ট নেয় এবং তার বেশি হলে 429 (RESOURCE_EXHAUSTED) ফেরত দেয়।
+# FakeWorksheet হলো gspread Worksheet এর যে মেথডগুলো অ্যাপ ব্যবহার করে তার HTTP ক্লায়েন্ট —
+# প্রতিটি মেথড কল সার্ভারে একটি রিকোয়েস্ট, যা requests এ গোনা হয়। fail_next() দিয়ে
+# নির্দিষ্ট রিকোয়েস্ট ব্যর্থ করা যায় (429, অথবা লেখা হয়ে যাওয়ার পরে রেসপন্স হারানো)।
+# clock ইনজেক্ট করা যায়, তাই টেস্টে নকল সময় দিয়ে কোনো অপেক্ষা ছাড়াই কোটা ও backoff যাচাই করা যায়।
+# -----------------------------------------------------------------------------
+READS = {'row_values', 'get', 'get_all_values', 'batch_get'}
+WRITES = {'append_rows', 'delete_rows', 'batch_update'}
+
+class APIError(Exception):
+    # gspread APIError এর মতো code সহ
+    def __init__(self, message, code):
+        super().__init__(message)
+        self.code = code
+
+class RateLimitError(APIError):
+    def __init__(self, message="429 RESOURCE_EXHAUSTED: Quota exceeded"):
+        super().__init__(message, 429)
+
+class FakeClock:
+    # sleep() সময় এগিয়ে দেয় — QuotaBudget/BatchedSheetWriter এর clock ও sleep হিসেবে ব্যবহার
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def _column_number(letters):
+    number = 0
+    for c in letters:
+        number = number * 26 + ord(c) - ord('A') + 1
+    return number
+
+def _column_letters(number):
+    letters = ''
+    while number:
+        number, rem = divmod(number - 1, 26)
+        letters = chr(ord('A') + rem) + letters
+    return letters
+
+def parse_range(a1):
+    # "A5:G", "B2:B", "A2", "1:1" -> (প্রথম রো, প্রথম কলাম, শেষ রো, শেষ কলাম); খোলা প্রান্ত None
+    a1 = a1.split('!')[-1].replace('$', '')
+    start, _, end = a1.partition(':')
+    (c1, r1), (c2, r2) = [re.fullmatch(r'([A-Z]*)(\d*)', part).groups() for part in (start, end or start)]
+    return (int(r1) if r1 else 1, _column_number(c1) if c1 else 1,
+            int(r2) if r2 else None, _column_number(c2) if c2 else None)
+
+class FakeSheetsServer:
+    def __init__(self, limit=60, period=60.0, latency=0.0, clock=time.monotonic, read_limit=None):
+        self.write_limit = limit
+        self.read_limit = read_limit or limit
+        self.period = period
+        self.latency = latency
+        self.clock = clock
+        self.tabs = {}                  # ট্যাবের নাম -> [[ঘরের মান (string)], ...]
+        self.requests = Counter()       # মেথড -> সার্ভারে পৌঁছানো রিকোয়েস্ট (প্রত্যাখ্যাত সহ)
+        self.writes = 0                 # সফলভাবে প্রয়োগ হওয়া write রিকোয়েস্ট
+        self.rejected = 0
+        self._calls = {'read': deque(), 'write': deque()}
+        self._faults = []               # [(মেথড, ট্যাব, lost)] — fail_next() দেখুন
+        self._lock = threading.Lock()
+        self._server = None
+
+    def fail_next(self, method, tab=None, times=1, lost=False):
+        # পরের `times` টি `method` রিকোয়েস্ট ব্যর্থ হবে। lost=False: 429, কিছুই লেখা হয় না।
+        # lost=True: রিকোয়েস্ট প্রয়োগ হয় কিন্তু ক্লায়েন্ট 500 পায় (রেসপন্স হারানো টাইমআউটের মতো)
+        with self._lock:
+            self._faults.extend([(method, tab, lost)] * times)
+
+    def rows(self, tab='Sheet1'):
+        # হেডারের পরের ডাটা রো, হেডার কলাম অনুযায়ী dict হিসেবে
+        values = self.tabs.get(tab) or [[]]
+        header = values[0]
+        return [dict(zip(header, row + [''] * (len(header) - len(row)))) for row in values[1:]]
+
+    def _admit(self, method, tab):
+        kind = 'read' if method in READS else 'write'
+        with self._lock:
+            self.requests[method] += 1
+            now = self.clock()
+            calls = self._calls[kind]
+            while calls and now - calls[0] >= self.period:
+                calls.popleft()
+            if len(calls) >= (self.read_limit if kind == 'read' else self.write_limit):
+                self.rejected += 1
+                return 429
+            calls.append(now)
+            for i, (fault_method, fault_tab, lost) in enumerate(self._faults):
+                if fault_method == method and fault_tab in (None, tab):
+                    del self._faults[i]
+                    if lost:
+                        return 500
+                    self.rejected += 1
+                    return 429
+            return 200
+
+    def handle(self, method, tab, params):
+        # রিটার্ন: (HTTP status, রেসপন্স)
+        status = self._admit(method, tab)
+        if status == 429:
+            return status, {'error': {'code': 429, 'status': 'RESOURCE_EXHAUSTED'}}
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            values = self.tabs.setdefault(tab, [])
+            result = getattr(self, '_' + method)(tab, values, **params)
+            if method in WRITES:
+                self.writes += 1
+        if status == 500:
+            return status, {'error': {'code': 500, 'status': 'INTERNAL'}}
+        return status, result
+
+    # ---- gspread Worksheet মেথডের সার্ভার-সাইড ইমপ্লিমেন্টেশন ----
+    @staticmethod
+    def _slice(values, a1):
+        r1, c1, r2, c2 = parse_range(a1)
+        rows = values[r1 - 1:r2]
+        cells = [[str(v) for v in row[c1 - 1:c2]] for row in rows]
+        # গুগল শিটের মতো শেষের খালি রো/ঘর বাদ দেওয়া
+        cells = [row[:max([i + 1 for i, v in enumerate(row) if v != ''], default=0)] for row in cells]
+        while cells and not cells[-1]:
+            cells.pop()
+        return cells
+
+    def _get(self, tab, values, range_name):
+        return self._slice(values, range_name)
+
+    def _batch_get(self, tab, values, ranges):
+        return [self._slice(values, a1) for a1 in ranges]
+
+    def _row_values(self, tab, values, row):
+        return values[row - 1] if row <= len(values) else []
+
+    def _get_all_values(self, tab, values):
+        width = max((len(row) for row in values), default=0)
+        return [row + [''] * (width - len(row)) for row in values]
+
+    def _append_rows(self, tab, values, rows):
+        while values and not any(v != '' for v in values[-1]):
+            values.pop()
+        first = len(values) + 1
+        values.extend([['' if v is None else str(v) for v in row] for row in rows])
+        width = max((len(row) for row in rows), default=1)
+        return {'updates': {'updatedRange': f"'{tab}'!A{first}:{_column_letters(width)}{first + len(rows) - 1}",
+                            'updatedRows': len(rows)}}
+
+    def _delete_rows(self, tab, values, start_index, end_index=None):
+        del values[start_index - 1:end_index or start_index]
+        return {}
+
+    def _batch_update(self, tab, values, data):
+        for item in data:
+            r1, c1, r2, c2 = parse_range(item['range'])
+            for i, row in enumerate(item['values']):
+                while len(values) < r1 + i:
+                    values.append([])
+                target = values[r1 - 1 + i]
+                for j, value in enumerate(row):
+                    while len(target) < c1 + j:
+                        target.append('')
+                    target[c1 - 1 + j] = '' if value is None else str(value)
+        return {'totalUpdatedCells': sum(len(row) for item in data for row in item['values'])}
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                status, result = fake.handle(self.path.strip('/'), body['tab'], body['params'])
+                payload = json.dumps(result).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, name="fake-sheets", daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def worksheet(self, title='Sheet1'):
+        return FakeWorksheet(self, title)
+
+class FakeWorksheet:
+    # gspread Worksheet এর মতো ক্লায়েন্ট — প্রতিটি কল সার্ভারে ঠিক একটি HTTP রিকোয়েস্ট
+    def __init__(self, server, title):
+        self.server = server
+        self.title = title
+
+    def _call(self, method, **params):
+        request = urllib.request.Request(f"{self.server.url}/{method}", method='POST',
+                                         data=json.dumps({'tab': self.title, 'params': params}).encode('utf-8'))
+        try:
+            with urllib.request.urlopen(request) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            if e.code == 429:
+                raise RateLimitError() from None
+            raise APIError(f"{e.code} {e.read().decode('utf-8')}", e.code) from None
+
+    def row_values(self, row, **kwargs):
+        return self._call('row_values', row=row)
+
+    def get(self, range_name=None, **kwargs):
+        return self._call('get', range_name=range_name or 'A1:ZZ')
+
+    def get_all_values(self, **kwargs):
+        return self._call('get_all_values')
+
+    def batch_get(self, ranges, **kwargs):
+        return self._call('batch_get', ranges=list(ranges))
+
+    def append_rows(self, values, value_input_option='RAW', insert_data_option=None, table_range=None, **kwargs):
+        return self._call('append_rows', rows=values)
+
+    def delete_rows(self, start_index, end_index=None):
+        return self._call('delete_rows', start_index=start_index, end_index=end_index)
+
+    def batch_update(self, data, **kwargs):
+        return self._call('batch_update', data=data)
@@ -0,0 +1,121 @@
+import threading
+import pytest
+import batch_writer
+from batch_writer import BatchedSheetWriter, MeteredWorksheet, QuotaBudget, is_rate_limited
+from fake_sheets import FakeClock, FakeSheetsServer, RateLimitError
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def server(clock):
+    server = FakeSheetsServer(limit=2, period=60.0, clock=clock).start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def sheet(server):
+    return server.worksheet()
+
+def append(sheet):
+    return lambda rows: sheet.append_rows([[row['row']] for row in rows])
+
+def stored(server):
+    return [int(row[0]) for row in server.tabs['Sheet1']]
+
+def test_quota_budget_blocks_until_oldest_call_leaves_window(clock):
+    budget = QuotaBudget(limit=3, period=60.0, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        budget.acquire()
+    assert clock.sleeps == [] and budget.remaining() == 0
+
+    clock.now = 20.0
+    budget.acquire()
+    assert clock.sleeps == [40.0]
+    assert clock.now == 60.0
+
+def test_budget_keeps_writes_under_server_quota(server, sheet, clock):
+    writer = BatchedSheetWriter(append(sheet), budget=QuotaBudget(limit=2, period=60.0, clock=clock, sleep=clock.sleep),
+                                sleep=clock.sleep)
+    for i in range(5):
+        writer.run_exclusive(writer.append_fn, [{'row': i}])
+    assert server.rejected == 0 and writer.stats['retries'] == 0
+    assert stored(server) == [0, 1, 2, 3, 4]
+    assert clock.now == 120.0
+
+def test_metered_worksheet_counts_every_request(server, sheet, clock):
+    reads = QuotaBudget(limit=1, period=60.0, clock=clock, sleep=clock.sleep)
+    writes = QuotaBudget(limit=2, period=60.0, clock=clock, sleep=clock.sleep)
+    metered = MeteredWorksheet(sheet, reads, writes)
+    metered.append_rows([[0]])
+    metered.row_values(1)
+    metered.append_rows([[1]])
+    assert clock.sleeps == [] and reads.remaining() == 0 and writes.remaining() == 0
+    # তৃতীয় write কোটা খালি হওয়া পর্যন্ত অপেক্ষা করে, সার্ভারে কখনো 429 হয় না
+    metered.delete_rows(1)
+    assert clock.sleeps == [60.0] and server.rejected == 0
+    assert server.requests == {'append_rows': 2, 'row_values': 1, 'delete_rows': 1}
+    assert metered.title == 'Sheet1'
+
+def test_rate_limited_write_backs_off_and_retries(server, sheet, clock, monkeypatch):
+    # jitter বাদ দিয়ে সর্বোচ্চ অপেক্ষা: 30 s, তারপর 60 s
+    monkeypatch.setattr(batch_writer.random, 'uniform', lambda low, high: high)
+    writer = BatchedSheetWriter(append(sheet), base_delay=30.0, max_delay=120.0, sleep=clock.sleep)
+    writer.run_exclusive(writer.append_fn, [{'row': 0}])
+    writer.run_exclusive(writer.append_fn, [{'row': 1}])
+    writer.run_exclusive(writer.append_fn, [{'row': 2}])
+
+    assert server.rejected == 2
+    assert writer.stats['retries'] == 2
+    assert clock.sleeps == [30.0, 60.0]
+    assert stored(server) == [0, 1, 2]
+
+def test_backoff_gives_up_after_max_retries(server, sheet, clock):
+    writer = BatchedSheetWriter(append(sheet), max_retries=2, base_delay=0.001, max_delay=0.001, sleep=clock.sleep)
+    writer.run_exclusive(writer.append_fn, [{'row': 0}])
+    writer.run_exclusive(writer.append_fn, [{'row': 1}])
+    with pytest.raises(RateLimitError) as error:
+        writer.run_exclusive(writer.append_fn, [{'row': 2}])
+    assert is_rate_limited(error.value)
+    assert server.rejected == 3 and writer.stats['retries'] == 2
+
+def test_backoff_is_full_jitter_and_capped():
+    writer = BatchedSheetWriter(lambda rows: None, base_delay=1.0, max_delay=8.0)
+    for attempt in range(10):
+        assert all(0 <= writer.backoff(attempt) <= min(8.0, 2 ** attempt) for _ in range(50))
+
+def test_concurrent_submissions_are_coalesced_into_one_write():
+    server = FakeSheetsServer(limit=60).start()
+    try:
+        writer = BatchedSheetWriter(append(server.worksheet()), window=0.2)
+        futures = [None] * 20
+        def submit(i):
+            futures[i] = writer.submit([{'row': i}, {'row': i}])
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(20)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        assert [f.result(timeout=10) for f in futures] == [2] * 20
+        assert sorted(stored(server)) == sorted(list(range(20)) * 2)
+        assert server.writes < 20
+        writer.close()
+    finally:
+        server.stop()
+
+def test_withdraw_only_removes_submissions_not_yet_sent():
+    started, release = threading.Event(), threading.Event()
+    def blocking_append(rows):
+        started.set()
+        release.wait(10)
+    writer = BatchedSheetWriter(blocking_append, window=0)
+    in_flight = writer.submit([{'row': 0}])
+    assert started.wait(10)
+    queued = writer.submit([{'row': 1}])
+
+    assert writer.withdraw(queued) is True
+    assert queued.cancelled()
+    assert writer.withdraw(in_flight) is False
+
+    release.set()
+    assert in_flight.result(timeout=10) == 1
+    writer.close()
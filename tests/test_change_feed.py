@@ -0,0 +1,206 @@
+import json
+import sqlite3
+import pytest
+import change_feed_consumer
+from change_feed import ChangeFeed, SheetChangeFeed
+from change_feed_consumer import SCHEMA, consume, load_cursor
+from fake_sheets import APIError, FakeSheetsServer
+
+def row(i, district="গাজীপুর"):
+    return {"Timestamp": f"2025-01-01 10:00:{i % 60:02d}", "নাম": f"officer{i}", "বিভাগ": "ঢাকা", "জেলা": district}
+
+def produce(feed, start, count):
+    # insert/update/delete মিলিয়ে count টি ইভেন্ট
+    seqs = []
+    for i in range(start, start + count):
+        if i % 5 == 3:
+            seqs += feed.append("update", [row(i, "নরসিংদী")], row_indexes=[i], before=[row(i)])
+        elif i % 7 == 6:
+            seqs += feed.append("delete", [row(i)], row_indexes=[i])
+        else:
+            seqs += feed.append("insert", [row(i)], row_indexes=[i])
+    return seqs
+
+def open_db(path):
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    return db
+
+def drain(feed, db, batch_size=7):
+    total = 0
+    while True:
+        applied = consume(feed, db, batch_size=batch_size)
+        if not applied:
+            return total
+        total += applied
+
+def applied_seqs(db):
+    return [seq for (seq,) in db.execute("SELECT seq FROM changes ORDER BY seq")]
+
+@pytest.fixture
+def feed(tmp_path):
+    return ChangeFeed(str(tmp_path / "changes.jsonl"))
+
+def test_exactly_once_replay_after_restart(feed, tmp_path):
+    db_path = str(tmp_path / "mirror.sqlite")
+    produce(feed, 0, 40)
+
+    db = open_db(db_path)
+    assert consume(feed, db, batch_size=15) == 15
+    assert consume(feed, db, batch_size=15) == 15
+    db.close()                                  # কনজিউমার রিস্টার্ট
+
+    produce(feed, 40, 20)
+    db = open_db(db_path)
+    assert drain(feed, db) == 30
+    assert drain(feed, db) == 0
+    assert applied_seqs(db) == list(range(1, 61))
+
+def test_crash_mid_batch_rolls_back_and_resumes(feed, tmp_path, monkeypatch):
+    db_path = str(tmp_path / "mirror.sqlite")
+    produce(feed, 0, 30)
+    original = change_feed_consumer.apply_event
+
+    def crash_on_seq_12(db, event):
+        if event["seq"] == 12:
+            raise RuntimeError("killed")
+        original(db, event)
+
+    db = open_db(db_path)
+    monkeypatch.setattr(change_feed_consumer, "apply_event", crash_on_seq_12)
+    assert consume(feed, db, batch_size=10) == 10
+    with pytest.raises(RuntimeError):
+        consume(feed, db, batch_size=10)        # seq 11..20 এর ব্যাচ মাঝপথে ব্যর্থ
+    db.close()
+
+    monkeypatch.setattr(change_feed_consumer, "apply_event", original)
+    db = open_db(db_path)
+    assert load_cursor(db)["seq"] == 10
+    drain(feed, db)
+    assert applied_seqs(db) == list(range(1, 31))
+    # update/delete সহ জেলা ভিত্তিক রো সংখ্যাও পুরো ফিড একবার প্রয়োগের সমান
+    inserts = sum(1 for i in range(30) if i % 5 != 3 and i % 7 != 6)
+    deletes = sum(1 for i in range(30) if i % 5 != 3 and i % 7 == 6)
+    updates = sum(1 for i in range(30) if i % 5 == 3)
+    counts = dict(db.execute("SELECT district, rows FROM district_rows").fetchall())
+    assert counts == {"গাজীপুর": inserts - deletes - updates, "নরসিংদী": updates}
+
+def test_torn_line_is_skipped_then_repaired(feed, tmp_path):
+    db = open_db(str(tmp_path / "mirror.sqlite"))
+    produce(feed, 0, 10)
+    with open(feed.path, "ab") as f:            # লেখার মাঝপথে crash — অসম্পূর্ণ শেষ লাইন
+        f.write(b'{"epoch": "x", "seq": 11, "op": "ins')
+
+    assert drain(feed, db) == 10
+    assert load_cursor(db)["seq"] == 10
+
+    assert produce(feed, 10, 5) == [11, 12, 13, 14, 15]
+    assert drain(feed, db) == 5
+    assert applied_seqs(db) == list(range(1, 16))
+    with open(feed.path, "rb") as f:
+        assert all(json.loads(line)["seq"] == n for n, line in enumerate(f, start=1))
+
+def test_recreated_feed_gets_new_epoch_and_is_not_skipped(feed, tmp_path, capsys):
+    db = open_db(str(tmp_path / "mirror.sqlite"))
+    produce(feed, 0, 3)
+    assert drain(feed, db) == 3
+    old_epoch = load_cursor(db)["epoch"]
+
+    (tmp_path / "changes.jsonl").unlink()       # রিবুটে লোকাল ডিস্ক মুছে গেছে
+    assert feed.append("insert", [row(99)], row_indexes=[3]) == [1]
+
+    assert drain(feed, db) == 1
+    cursor = load_cursor(db)
+    assert cursor["epoch"] != old_epoch and cursor["seq"] == 1
+    assert db.execute("SELECT COUNT(*) FROM changes").fetchone()[0] == 4
+    assert "epoch changed" in capsys.readouterr().err
+
+@pytest.fixture
+def server():
+    server = FakeSheetsServer(limit=1000).start()
+    yield server
+    server.stop()
+
+def test_sheet_feed_survives_restart_and_replays_exactly_once(server, tmp_path):
+    tab = server.worksheet("changes")
+    produce(SheetChangeFeed(tab), 0, 12)
+
+    db_path = str(tmp_path / "mirror.sqlite")
+    db = open_db(db_path)
+    assert consume(SheetChangeFeed(tab), db, batch_size=5) == 5
+    db.close()
+
+    produce(SheetChangeFeed(tab), 12, 8)            # অ্যাপ রিস্টার্টের পরেও seq চলতে থাকে
+    db = open_db(db_path)
+    assert drain(SheetChangeFeed(tab), db, batch_size=5) == 15
+    assert applied_seqs(db) == list(range(1, 21))
+    event = json.loads(db.execute("SELECT payload FROM changes WHERE seq = 4").fetchone()[0])
+    assert event["op"] == "update" and event["before"]["জেলা"] == "গাজীপুর" and event["row_index"] == 3
+    # প্রতিটি append একটি রিকোয়েস্ট, পুরো ট্যাব কখনো আবার লেখা বা পড়া হয় না
+    assert server.requests["append_rows"] == 20 and server.requests["get_all_values"] == 0
+
+def test_sheet_feed_reader_only_fetches_rows_after_the_cursor(server):
+    tab = server.worksheet("changes")
+    produce(SheetChangeFeed(tab), 0, 20)
+    ranges = []
+    fetch = tab.batch_get
+    tab.batch_get = lambda r, **kwargs: ranges.append(r) or fetch(r)
+
+    feed = SheetChangeFeed(tab)
+    events, cursor = feed.read(None, limit=5)
+    events, cursor = feed.read(cursor, limit=5)
+    assert [e["seq"] for e in events] == [6, 7, 8, 9, 10]
+    assert ranges == [["A2", "A2:G6"], ["A2", "A7:G11"]]
+    assert feed.read(cursor)[0][-1]["seq"] == 20
+
+def test_sheet_feed_restarts_from_the_top_after_the_tab_is_recreated(server, capsys, tmp_path):
+    tab = server.worksheet("changes")
+    produce(SheetChangeFeed(tab), 0, 6)
+    db = open_db(str(tmp_path / "mirror.sqlite"))
+    assert drain(SheetChangeFeed(tab), db) == 6
+
+    server.tabs["changes"] = []                     # কেউ ট্যাবটি মুছে দিয়েছে
+    assert SheetChangeFeed(tab).append("insert", [row(99)], row_indexes=[6]) == [1]
+    assert drain(SheetChangeFeed(tab), db) == 1
+    assert load_cursor(db)["seq"] == 1 and "epoch changed" in capsys.readouterr().err
+
+def submitting_writer(server, feed):
+    from batch_writer import BatchedSheetWriter
+    from sheet_store import deliver_changes, gsheets_appender
+    writer = BatchedSheetWriter(gsheets_appender(server.worksheet(), feed), window=0, max_retries=2,
+                                base_delay=0.001, max_delay=0.001)
+    writer.flush_hooks.append(lambda: deliver_changes(writer, feed))
+    return writer
+
+def test_failed_feed_write_keeps_events_for_the_next_flush(server, tmp_path):
+    feed = SheetChangeFeed(server.worksheet("changes"))
+    writer = submitting_writer(server, feed)
+    # ফিড ট্যাবে লেখা ৩ বার 429 — writer এর retry শেষ, কিন্তু অফিসারের সাবমিট সফল
+    server.fail_next("append_rows", tab="changes", times=3)
+    assert writer.submit([row(0), row(1)]).result(timeout=10) == 2
+    writer.close()
+    assert len(server.rows("Sheet1")) == 2 and feed.pending() == 2 and not server.tabs["changes"]
+
+    writer = submitting_writer(server, feed)
+    writer.submit([row(2)]).result(timeout=10)
+    writer.close()
+    assert feed.pending() == 0
+
+    db = open_db(str(tmp_path / "mirror.sqlite"))
+    assert drain(SheetChangeFeed(server.worksheet("changes")), db) == 3
+    assert [json.loads(p)["row_index"] for (p,) in db.execute("SELECT payload FROM changes ORDER BY seq")] == [0, 1, 2]
+
+def test_lost_feed_response_is_not_written_twice(server, tmp_path):
+    feed = SheetChangeFeed(server.worksheet("changes"))
+    feed.append("insert", [row(0)], row_indexes=[0])
+    # রিকোয়েস্ট ট্যাবে পৌঁছেছে কিন্তু রেসপন্স হারিয়েছে — ইভেন্ট outbox এ থাকে
+    server.fail_next("append_rows", tab="changes", lost=True)
+    with pytest.raises(APIError):
+        feed.append("insert", [row(1), row(2)], row_indexes=[1, 2])
+    assert feed.pending() == 2
+
+    feed.enqueue("delete", [row(0)], row_indexes=[0])
+    assert feed.deliver() == [4]
+    db = open_db(str(tmp_path / "mirror.sqlite"))
+    assert drain(SheetChangeFeed(server.worksheet("changes")), db) == 4
+    assert applied_seqs(db) == [1, 2, 3, 4]
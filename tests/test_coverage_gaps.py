@@ -0,0 +1,66 @@
+from coverage_gaps import CoverageIndex
+
+TREE = {
+    'ঢাকা': {
+        'গাজীপুর': {'কালীগঞ্জ': ['বক্তারপুর', 'জামালপুর'], 'কাপাসিয়া': ['তরগাঁও']},
+        'নরসিংদী': {'পলাশ': ['ঘোড়াশাল']},
+    },
+    'রাজশাহী': {
+        'বগুড়া': {'শেরপুর': ['মির্জাপুর', 'খামারকান্দি']},
+    },
+}
+
+def test_sync_adds_only_appended_rows_for_the_same_generation():
+    index = CoverageIndex(TREE)
+    keys = [('ঢাকা', 'গাজীপুর', 'কালীগঞ্জ', 'বক্তারপুর')]
+    index.sync(keys, 'g1')
+    assert (index.submitted_upazilas, index.submitted_unions, index.rows) == (1, 1, 1)
+
+    keys = keys + [('ঢাকা', 'গাজীপুর', 'কালীগঞ্জ', 'জামালপুর'), ('রাজশাহী', 'বগুড়া', 'শেরপুর', 'মির্জাপুর')]
+    added = []
+    index.add = lambda *key: added.append(key)
+    index.sync(keys, 'g1')
+    # একই generation: আগের রো আবার যোগ হয় না
+    assert added == keys[1:] and index.rows == 3
+
+def test_sync_rebuilds_when_the_generation_changes():
+    index = CoverageIndex(TREE)
+    index.sync([('ঢাকা', 'গাজীপুর', 'কালীগঞ্জ', 'বক্তারপুর'), ('ঢাকা', 'নরসিংদী', 'পলাশ', 'ঘোড়াশাল')], 'g1')
+    assert index.submitted_upazilas == 2
+
+    # মাঝের রো এডিট হয়ে অন্য ইউনিয়ন হয়েছে — পুরোনো কভারেজ থেকে যাওয়া চলবে না
+    edited = [('ঢাকা', 'গাজীপুর', 'কালীগঞ্জ', 'বক্তারপুর'), ('ঢাকা', 'গাজীপুর', 'কাপাসিয়া', 'তরগাঁও')]
+    index.sync(edited, 'g2')
+    assert index.generation == 'g2' and index.rows == 2
+    assert ('ঢাকা', 'নরসিংদী', 'পলাশ') not in index.covered_upz
+    assert index.covered_uni == {edited[0], edited[1]}
+
+    # সংখ্যা কমে গেলেও (ডিলিট) generation ছাড়াই নতুন করে বানানো হয়
+    index.sync(edited[:1], 'g2')
+    assert index.covered_uni == {edited[0]}
+
+def test_missing_upazilas_and_unions():
+    index = CoverageIndex(TREE)
+    index.sync([('ঢাকা', 'গাজীপুর', 'কালীগঞ্জ', 'বক্তারপুর')], 'g1')
+    assert index.missing_upazilas('ঢাকা', 'গাজীপুর') == [('ঢাকা', 'গাজীপুর', 'কাপাসিয়া')]
+    assert index.missing_upazilas('রাজশাহী') == [('রাজশাহী', 'বগুড়া', 'শেরপুর')]
+    assert index.missing_unions('ঢাকা', 'গাজীপুর', 'কালীগঞ্জ') == [('ঢাকা', 'গাজীপুর', 'কালীগঞ্জ', 'জামালপুর')]
+    assert len(index.missing_unions()) == index.total_unions - 1
+
+def test_district_summary_counts_remaining_areas():
+    index = CoverageIndex(TREE)
+    index.sync([('ঢাকা', 'গাজীপুর', 'কালীগঞ্জ', 'বক্তারপুর'), ('ঢাকা', 'গাজীপুর', 'কালীগঞ্জ', 'বক্তারপুর')], 'g1')
+    summary = {row['জেলা']: row for row in index.district_summary('ঢাকা')}
+    assert set(summary) == {'গাজীপুর', 'নরসিংদী'}
+    assert summary['গাজীপুর'] == {'বিভাগ': 'ঢাকা', 'জেলা': 'গাজীপুর', 'মোট উপজেলা': 2, 'বাকি উপজেলা': 1,
+                                  'মোট ইউনিয়ন': 3, 'বাকি ইউনিয়ন': 2}
+    assert summary['নরসিংদী']['বাকি ইউনিয়ন'] == 1
+
+def test_free_text_keys_go_to_unknown():
+    index = CoverageIndex(TREE)
+    index.sync([('ঢাকা', 'গাজীপুর', 'অন্য উপজেলা', 'কোনো ইউনিয়ন'),
+                ('ঢাকা', 'গাজীপুর', 'কালীগঞ্জ', 'হাতে লেখা ইউনিয়ন')], 'g1')
+    assert index.unknown == {('ঢাকা', 'গাজীপুর', 'অন্য উপজেলা', 'কোনো ইউনিয়ন'),
+                             ('ঢাকা', 'গাজীপুর', 'কালীগঞ্জ', 'হাতে লেখা ইউনিয়ন')}
+    # চেনা উপজেলা কভার হয়, কিন্তু অচেনা ইউনিয়ন কভারেজে গোনা হয় না
+    assert index.covered_upz == {('ঢাকা', 'গাজীপুর', 'কালীগঞ্জ')} and index.submitted_unions == 0
@@ -0,0 +1,50 @@
+from geo_index import GeoIndex, normalize_name
+
+RECORDS = [
+    ('division', ('Dhaka',), ['Dhaka', 'ঢাকা']),
+    ('division', ('Rajshahi',), ['Rajshahi', 'রাজশাহী']),
+    ('district', ('Dhaka', 'Gazipur'), ['Gazipur', 'গাজীপুর']),
+    ('district', ('Rajshahi', 'Bogura'), ['Bogura', 'Bogra', 'বগুড়া']),
+    ('upazila', ('Dhaka', 'Gazipur', 'Kaliganj'), ['Kaliganj', 'কালীগঞ্জ']),
+    ('upazila', ('Rajshahi', 'Bogura', 'Sherpur'), ['Sherpur', 'শেরপুর']),
+    ('union', ('Dhaka', 'Gazipur', 'Kaliganj', 'Baktarpur'), ['Baktarpur']),
+    ('union', ('Rajshahi', 'Bogura', 'Sherpur', 'Mirzapur'), ['Mirzapur']),
+    ('union', ('Dhaka', 'Gazipur', 'Kaliganj', 'Mirzapur'), ['Mirzapur']),
+]
+
+def test_normalize_name_keeps_zwj_inside_the_word():
+    assert normalize_name('র\u200d্যাব') == 'র্যাব'
+    assert normalize_name('Gazipur  Zila,') == 'gazipur'
+
+def test_scoped_lookup_only_returns_names_under_the_parent():
+    index = GeoIndex(RECORDS)
+    everywhere = index.suggest('Mirzapur', 'union')
+    assert {m.path for m in everywhere} == {('Rajshahi', 'Bogura', 'Sherpur', 'Mirzapur'),
+                                            ('Dhaka', 'Gazipur', 'Kaliganj', 'Mirzapur')}
+    scoped = index.suggest('Mirzapur', 'union', scope=('Rajshahi', 'Bogura', 'Sherpur'))
+    assert [m.path for m in scoped] == [('Rajshahi', 'Bogura', 'Sherpur', 'Mirzapur')]
+    # অচেনা প্যারেন্ট হলে যতটুকু চেনা যায় সেই স্কোপে খোঁজা হয়
+    partial = index.suggest('Mirzapur', 'union', scope=('Dhaka', 'Gazipur', 'অজানা'))
+    assert [m.path for m in partial] == [('Dhaka', 'Gazipur', 'Kaliganj', 'Mirzapur')]
+
+def test_fuzzy_lookup_ranks_the_misspelled_name_first():
+    index = GeoIndex(RECORDS)
+    assert index.suggest('Gajipur', 'district')[0].name == 'Gazipur'
+
+def test_reconcile_fixes_misspellings_and_keeps_unmatched_levels():
+    index = GeoIndex(RECORDS)
+    key = ('Rajshahi Division', 'Bogra', 'Sherpurr', 'কোনো এক ইউনিয়ন')
+    fixed, scores = index.reconcile([key])[key]
+    assert fixed == ('Rajshahi', 'Bogura', 'Sherpur', 'কোনো এক ইউনিয়ন')
+    assert scores[:2] == [1.0, 1.0] and scores[2] >= 0.6 and scores[3] is None
+
+def test_reconcile_does_not_guess_between_duplicate_names():
+    index = GeoIndex(RECORDS + [('union', ('Dhaka', 'Gazipur', 'Kaliganj', 'Mirzapor'), ['Mirzapor'])])
+    # দুই বিভাগে একই নাম: ইউনিয়ন ঠিক হয়, কিন্তু উপরের লেভেল অচেনা থাকলে পাথ অনুমান করা হয় না
+    key = ('', '', '', 'Mirzapur')
+    fixed, scores = index.reconcile([key])[key]
+    assert fixed == ('', '', '', 'Mirzapur') and scores == [None, None, None, 1.0]
+    # একই স্কোরের দুটি ভিন্ন নাম হলে মূল লেখা রেখে দেওয়া হয়
+    key = ('Dhaka', 'Gazipur', 'Kaliganj', 'Mirzapxr')
+    fixed, scores = index.reconcile([key])[key]
+    assert fixed[3] == 'Mirzapxr' and scores[3] is None
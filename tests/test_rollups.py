@@ -0,0 +1,70 @@
+import pandas as pd
+from rollups import SubmissionRollups
+
+def make_rows(n, start=0):
+    rows = range(start, start + n)
+    return pd.DataFrame({
+        'Timestamp': [f"2025-01-{1 + i // 48:02d} {(i // 2) % 24:02d}:{i % 60:02d}:00" for i in rows],
+        'নাম': [f'officer{i // 3}' for i in rows],
+        'কর্মকর্তার যোগাযোগ নম্বর': ['01700000000'] * n,
+        'বিভাগ': [f'div{i % 2}' for i in rows],
+        'জেলা': [f'dist{i % 4}' for i in rows],
+        'উপজেলা': [f'upz{i % 6}' for i in rows],
+        'ইউনিয়ন': [f'uni{i % 10}' for i in rows],
+        'আওতাভুক্ত গ্রাম': [[2, None, '4', 'abc'][i % 4] for i in rows],
+        'ISP মোট সংখ্যা': [['', 3, '5', None][i % 4] for i in rows],
+    })
+
+def submission(ts, unions, name='রহিম', phone='01711111111'):
+    return [{'Timestamp': ts, 'নাম': name, 'কর্মকর্তার যোগাযোগ নম্বর': phone, 'বিভাগ': 'ঢাকা', 'জেলা': 'গাজীপুর',
+             'উপজেলা': 'কালীগঞ্জ', 'ইউনিয়ন': uni, 'আওতাভুক্ত গ্রাম': 3, 'ISP মোট সংখ্যা': '2'} for uni in unions]
+
+def test_incremental_sync_matches_full_rebuild():
+    df = pd.concat([make_rows(150), make_rows(130, 150)], ignore_index=True)
+    incremental = SubmissionRollups()
+    for end in (50, 51, 150, 280):
+        incremental.sync(df.iloc[:end], generation='g1')
+    rebuilt = SubmissionRollups()
+    rebuilt.sync(df, generation='g1')
+    assert incremental.rows == 280 and incremental.buckets == rebuilt.buckets
+
+def test_generation_change_rebuilds():
+    df = make_rows(40)
+    rollups = SubmissionRollups()
+    rollups.sync(df, generation='g1')
+    edited = df.copy()
+    edited.loc[5, 'জেলা'] = 'dist-edited'
+    rollups.sync(edited, generation='g2')
+    rebuilt = SubmissionRollups()
+    rebuilt.sync(edited, generation='g2')
+    assert rollups.buckets == rebuilt.buckets
+
+def test_multi_row_submission_is_counted_once():
+    rollups = SubmissionRollups()
+    rows = submission('2025-01-05 10:15:00', ['বক্তারপুর', 'জামালপুর', 'বক্তারপুর'])
+    rollups.sync(pd.DataFrame(rows), generation='g1')
+    frame = rollups.frame('day')
+    assert len(frame) == 1
+    # একটি সাবমিশন, দুটি আলাদা নতুন ইউনিয়ন, কিন্তু প্রতিটি রো-এর গ্রাম/ISP যোগ হয়
+    assert frame.loc[0, ['সাবমিশন', 'নতুন ইউনিয়ন', 'আওতাভুক্ত গ্রাম', 'ISP']].tolist() == [1, 2, 9, 6]
+
+def test_invalid_timestamps_are_skipped():
+    rows = submission('2025-01-05 10:15:00', ['বক্তারপুর']) + submission('', ['জামালপুর']) \
+        + submission('not a date', ['তরগাঁও']) + submission(None, ['ঘোড়াশাল'])
+    rollups = SubmissionRollups()
+    rollups.sync(pd.DataFrame(rows), generation='g1')
+    assert rollups.rows == 4
+    assert rollups.frame('day')['সাবমিশন'].sum() == 1 and rollups.seen_unions == {('ঢাকা', 'গাজীপুর', 'কালীগঞ্জ', 'বক্তারপুর')}
+
+def test_hour_and_day_buckets():
+    rows = submission('2025-01-05 10:15:00', ['বক্তারপুর']) + submission('2025-01-05 10:59:59', ['জামালপুর'], name='করিম') \
+        + submission('2025-01-05 11:00:00', ['তরগাঁও'], name='সালমা') + submission('2025-01-06 09:00:00', ['ঘোড়াশাল'], name='রফিক')
+    rollups = SubmissionRollups()
+    rollups.sync(pd.DataFrame(rows), generation='g1')
+    hourly = rollups.frame('hour')
+    assert hourly['সময়'].dt.strftime('%Y-%m-%d %H').tolist() == ['2025-01-05 10', '2025-01-05 11', '2025-01-06 09']
+    assert hourly['সাবমিশন'].tolist() == [2, 1, 1]
+    daily = rollups.frame('day')
+    assert daily['সময়'].dt.strftime('%Y-%m-%d').tolist() == ['2025-01-05', '2025-01-06']
+    assert daily['সাবমিশন'].tolist() == [3, 1]
+    assert rollups.frame('day', division='রাজশাহী').empty
@@ -0,0 +1,83 @@
+import pytest
+from batch_writer import BatchedSheetWriter, MeteredWorksheet, QuotaBudget
+from fake_sheets import FakeClock, FakeSheetsServer
+from sheet_store import SHEET_COLUMNS, cell_updates, gsheets_appender, read_sheet
+
+class RecordingFeed:
+    def __init__(self):
+        self.events = []
+
+    def enqueue(self, op, rows, row_indexes=None, before=None):
+        self.events.extend((op, i, row['নাম']) for i, row in zip(row_indexes, rows))
+
+def submission(i, unions=1):
+    return [{'Timestamp': f'2025-01-01 10:00:{i:02d}', 'নাম': f'officer{i}', 'কর্মকর্তার যোগাযোগ নম্বর': '01700000000',
+             'বিভাগ': 'ঢাকা', 'জেলা': 'গাজীপুর', 'উপজেলা': 'কালীগঞ্জ', 'ইউনিয়ন': f'ইউনিয়ন{u}', 'মোট গ্রাম': 5,
+             'আওতাভুক্ত গ্রাম': None, 'ISP মোট সংখ্যা': ''} for u in range(unions)]
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def server(clock):
+    server = FakeSheetsServer(limit=60, period=60.0, clock=clock).start()
+    yield server
+    server.stop()
+
+def test_append_writes_header_once_and_reports_row_positions(server):
+    feed = RecordingFeed()
+    append = gsheets_appender(server.worksheet(), feed)
+    append(submission(0, unions=2))
+    append(submission(1))
+
+    assert server.tabs['Sheet1'][0] == SHEET_COLUMNS
+    assert [row['নাম'] for row in server.rows()] == ['officer0', 'officer0', 'officer1']
+    assert server.rows()[0]['মোট গ্রাম'] == '5' and server.rows()[0]['আওতাভুক্ত গ্রাম'] == ''
+    assert feed.events == [('insert', 0, 'officer0'), ('insert', 1, 'officer0'), ('insert', 2, 'officer1')]
+    # প্রতি ব্যাচে ঠিক একটি হেডার read ও একটি append — পুরো শিট কখনো পড়া বা আবার লেখা হয় না
+    assert server.requests == {'row_values': 2, 'append_rows': 2}
+
+def test_unknown_column_is_rejected_before_anything_is_written(server):
+    append = gsheets_appender(server.worksheet())
+    append(submission(0))
+    with pytest.raises(ValueError):
+        append([dict(submission(1)[0], নতুন_কলাম='x')])
+    assert len(server.rows()) == 1 and server.requests['append_rows'] == 1
+
+def test_budget_counts_every_request_of_a_flush(server, clock):
+    reads = QuotaBudget(limit=60, period=60.0, clock=clock, sleep=clock.sleep)
+    writes = QuotaBudget(limit=60, period=60.0, clock=clock, sleep=clock.sleep)
+    writer = BatchedSheetWriter(gsheets_appender(MeteredWorksheet(server.worksheet(), reads, writes)), window=0,
+                                sleep=clock.sleep)
+    for i in range(3):
+        writer.submit(submission(i, unions=2))
+    writer.close()
+
+    assert len(server.rows()) == 6
+    assert 60 - reads.remaining() == server.requests['row_values']
+    assert 60 - writes.remaining() == server.requests['append_rows'] == writer.stats['batches']
+
+def test_rate_limited_append_is_retried_without_losing_or_duplicating_rows(server, clock):
+    feed = RecordingFeed()
+    writer = BatchedSheetWriter(gsheets_appender(server.worksheet(), feed), base_delay=0.001, max_delay=0.001,
+                                sleep=clock.sleep)
+    writer.run_exclusive(writer.append_fn, submission(0))
+    server.fail_next('append_rows', times=2)
+    writer.run_exclusive(writer.append_fn, submission(1, unions=3))
+
+    assert [row['নাম'] for row in server.rows()] == ['officer0'] + ['officer1'] * 3
+    assert writer.stats['retries'] == 2 and server.requests['append_rows'] == 4
+    assert [i for _, i, _ in feed.events] == [0, 1, 2, 3]
+
+def test_cell_updates_and_delete_are_single_requests(server):
+    sheet = server.worksheet()
+    gsheets_appender(sheet)(submission(0) + submission(1) + submission(2))
+    live = read_sheet(sheet)
+    assert live.loc[1, 'নাম'] == 'officer1' and live.loc[1, 'আওতাভুক্ত গ্রাম'] is None
+
+    sheet.batch_update(cell_updates(list(live.columns), [1, 2], [{'জেলা': 'নরসিংদী'}, {'উপজেলা': 'পলাশ'}]))
+    sheet.delete_rows(0 + 2)
+    assert [(r['নাম'], r['জেলা'], r['উপজেলা']) for r in server.rows()] == [
+        ('officer1', 'নরসিংদী', 'কালীগঞ্জ'), ('officer2', 'গাজীপুর', 'পলাশ')]
+    assert server.requests['batch_update'] == 1 and server.requests['delete_rows'] == 1
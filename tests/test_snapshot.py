@@ -0,0 +1,106 @@
+import threading
+import time
+import pandas as pd
+import pytest
+from batch_writer import BatchedSheetWriter
+from snapshot import SnapshotSync, StaleSnapshotError, assert_rows_unchanged
+
+def frame(n, start=0):
+    return pd.DataFrame({'Timestamp': [f'2025-01-01 10:00:{i:02d}' for i in range(start, start + n)],
+                         'নাম': [f'officer{i}' for i in range(start, start + n)],
+                         'জেলা': ['গাজীপুর'] * n, 'মোট গ্রাম': list(range(start, start + n))})
+
+@pytest.fixture
+def sheet():
+    return {'df': frame(5)}
+
+@pytest.fixture
+def snapshot(sheet, tmp_path):
+    return SnapshotSync(lambda: sheet['df'], path=str(tmp_path / 'survey.arrow'))
+
+def generation_after(snapshot):
+    snapshot.sync_once()
+    return snapshot.load().attrs['generation']
+
+def test_pure_append_keeps_the_generation(sheet, snapshot):
+    first = generation_after(snapshot)
+    sheet['df'] = pd.concat([sheet['df'], frame(3, start=5)], ignore_index=True)
+    assert generation_after(snapshot) == first
+    assert len(snapshot.load()) == 8 and snapshot.high_water['rows'] == 8
+    # কিছুই না বদলালে ফাইল আবার লেখা হয় না
+    assert snapshot.sync_once() is False
+
+def test_mid_sheet_edit_bumps_the_generation(sheet, snapshot):
+    first = generation_after(snapshot)
+    edited = sheet['df'].copy()
+    edited.loc[2, 'জেলা'] = 'নরসিংদী'
+    sheet['df'] = pd.concat([edited, frame(1, start=5)], ignore_index=True)
+    assert generation_after(snapshot) == first + 1
+    assert snapshot.load().loc[2, 'জেলা'] == 'নরসিংদী'
+
+def test_delete_bumps_the_generation(sheet, snapshot):
+    first = generation_after(snapshot)
+    sheet['df'] = sheet['df'].drop(index=1).reset_index(drop=True)
+    assert generation_after(snapshot) == first + 1
+
+def test_column_rename_bumps_the_generation(sheet, snapshot):
+    first = generation_after(snapshot)
+    sheet['df'] = sheet['df'].rename(columns={'মোট গ্রাম': 'গ্রাম'})
+    assert generation_after(snapshot) == first + 1
+
+def test_generation_survives_restart(sheet, snapshot, tmp_path):
+    sheet['df'] = sheet['df'].drop(index=1).reset_index(drop=True)
+    generation = generation_after(snapshot)
+    restarted = SnapshotSync(lambda: sheet['df'], path=str(tmp_path / 'survey.arrow'))
+    assert restarted.high_water['generation'] == generation and restarted.sync_once() is False
+
+def test_assert_rows_unchanged(sheet, snapshot):
+    snapshot.sync_once()
+    view = snapshot.load()
+    columns = ['Timestamp', 'নাম']
+    # স্ন্যাপশট string, লাইভ শিটে সংখ্যা — একই মান হলে মিলে যায়
+    assert_rows_unchanged(sheet['df'], view, [0, 4], columns + ['মোট গ্রাম'])
+
+    with pytest.raises(StaleSnapshotError, match='row 4 no longer exists'):
+        assert_rows_unchanged(sheet['df'].iloc[:4], view, [4], columns)
+    shifted = sheet['df'].drop(index=0).reset_index(drop=True)
+    with pytest.raises(StaleSnapshotError, match='row 1 changed'):
+        assert_rows_unchanged(shifted, view, [1], columns)
+    with pytest.raises(StaleSnapshotError):
+        assert_rows_unchanged(sheet['df'].rename(columns={'নাম': 'Name'}), view, [0], columns)
+
+def test_read_waits_for_an_in_flight_write(sheet, tmp_path):
+    started, release, reads = threading.Event(), threading.Event(), []
+    def blocking_append(rows):
+        started.set()
+        release.wait(10)
+    writer = BatchedSheetWriter(blocking_append, window=0)
+    def read():
+        reads.append(time.monotonic())
+        return sheet['df']
+    snapshot = SnapshotSync(lambda: writer.run_exclusive(read), path=str(tmp_path / 'survey.arrow'))
+
+    writer.submit([{'row': 0}])
+    assert started.wait(10)
+    syncing = threading.Thread(target=snapshot.sync_once)
+    syncing.start()
+    time.sleep(0.2)
+    assert reads == []      # ফ্লাশ চলাকালীন শিট পড়া হয় না
+    release.set()
+    syncing.join(10)
+    assert len(reads) == 1
+    writer.close()
+
+def test_refresh_requests_are_throttled(sheet, tmp_path):
+    reads = []
+    def read():
+        reads.append(time.monotonic())
+        return sheet['df']
+    snapshot = SnapshotSync(read, path=str(tmp_path / 'survey.arrow'), interval=60.0, min_gap=0.5).start()
+    deadline = time.monotonic() + 1.2
+    while time.monotonic() < deadline:
+        snapshot.request_refresh()
+        time.sleep(0.01)
+    # ~১২০টি অনুরোধ, কিন্তু প্রাথমিক সিঙ্কের পর প্রতি min_gap এ সর্বোচ্চ একটি
+    assert 2 <= len(reads) <= 4
+    assert all(b - a >= 0.45 for a, b in zip(reads, reads[1:]))